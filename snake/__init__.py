@@ -1,7 +1,9 @@
 """Snake package."""
 from .dir import Dir
 from .fruit import Fruit
+from .simulation import Simulation
 from .snake import Snake
+from .snapshot import Snapshot
 from .tile import Tile
 
-__all__ = ["Dir", "Fruit", "Snake", "Tile"]
+__all__ = ["Dir", "Fruit", "Simulation", "Snake", "Snapshot", "Tile"]
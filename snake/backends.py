@@ -0,0 +1,6 @@
+# ruff: noqa: D100
+
+# Names of the storages of scores, kept apart from their implementations so
+# that reading the command line loads neither of them
+BACKENDS = ("yaml", "sqlite")
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
@@ -0,0 +1,198 @@
+# ruff: noqa: D100,S311
+
+# Third party
+import numpy as np
+
+# First party
+from .dir import Dir
+from .simulation import SK_START_LENGTH
+
+# Actions, as indices in ACTIONS. NO_ACTION keeps the current direction.
+ACTIONS = (Dir.UP, Dir.DOWN, Dir.LEFT, Dir.RIGHT)
+NO_ACTION = -1
+
+_DX = np.array([d.x for d in ACTIONS], dtype = np.int64)
+_DY = np.array([d.y for d in ACTIONS], dtype = np.int64)
+
+class BatchSimulation:
+    """
+    Headless engine running N independent games in lockstep.
+
+    The rules are those of Simulation: the snake moves one cell per tick,
+    dies on itself (tail included), wraps around the board or dies when
+    exiting it if gameover_on_exit is set, grows by eating the fruit, and a
+    new fruit appears on a random free cell.
+
+    The whole state is held in NumPy arrays, one row per game: each snake's
+    body is a ring buffer of cell indices (cell = y * nb_cols + x) with the
+    head at `head_pos` and the tail `size - 1` slots after it, along with an
+    occupancy grid. A step advances all the games that are not over at once.
+    """
+
+    def __init__(self, n: int, nb_lines: int, nb_cols: int, *, # noqa: PLR0913
+                 snake_length: int = SK_START_LENGTH,
+                 gameover_on_exit: bool = False,
+                 seed: int | None = None) -> None:
+        """Object initialization."""
+        self._n = n
+        self._nb_lines = nb_lines
+        self._nb_cols = nb_cols
+        self._nb_cells = nb_lines * nb_cols
+        self._snake_length = snake_length
+        self._gameover_on_exit = gameover_on_exit
+        self._rng = np.random.default_rng(seed)
+        self._rows = np.arange(n)
+
+        self._body = np.zeros((n, self._nb_cells), dtype = np.int64)
+        self._occ = np.zeros((n, self._nb_cells), dtype = bool)
+        self._head_pos = np.zeros(n, dtype = np.int64)
+        self._size = np.zeros(n, dtype = np.int64)
+        self._length = np.zeros(n, dtype = np.int64)
+        self._dir = np.zeros(n, dtype = np.int64)
+        self._fruit = np.zeros(n, dtype = np.int64)
+        self._done = np.zeros(n, dtype = bool)
+        self._ticks = np.zeros(n, dtype = np.int64)
+        self.reset()
+
+    @property
+    def n(self) -> int:
+        """Number of games."""
+        return self._n
+
+    @property
+    def heads(self) -> np.ndarray:
+        """Cell index of each snake's head."""
+        return self._body[self._rows, self._head_pos]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Length of each snake, i.e.: the score of each game."""
+        return self._length.copy()
+
+    @property
+    def dirs(self) -> np.ndarray:
+        """Direction of each snake, as an index in ACTIONS."""
+        return self._dir.copy()
+
+    @property
+    def fruits(self) -> np.ndarray:
+        """Cell index of each fruit."""
+        return self._fruit.copy()
+
+    @property
+    def done(self) -> np.ndarray:
+        """Tell which games are over."""
+        return self._done.copy()
+
+    @property
+    def ticks(self) -> np.ndarray:
+        """Number of ticks played in each game since its last reset."""
+        return self._ticks.copy()
+
+    def body(self, i: int) -> np.ndarray:
+        """Cell indices of the snake of game i, head first."""
+        pos = (self._head_pos[i] + np.arange(self._size[i])) % self._nb_cells
+        body: np.ndarray = self._body[i, pos]
+        return body
+
+    def reset(self, mask: np.ndarray | None = None) -> None:
+        """Start new games, for all games or only where the mask is set."""
+        rows = self._rows if mask is None else np.flatnonzero(mask)
+        k = len(rows)
+        if k == 0:
+            return
+        length = self._snake_length
+
+        # Choose heads and directions
+        x = self._rng.integers(length - 1, self._nb_cols - length + 1, k)
+        y = self._rng.integers(length - 1, self._nb_lines - length + 1, k)
+        d = self._rng.integers(0, len(ACTIONS), k)
+
+        # Create bodies, extending opposite to the direction
+        self._occ[rows] = False
+        steps = np.arange(length)
+        cells = ((y[:, None] - steps * _DY[d][:, None]) * self._nb_cols +
+                 x[:, None] - steps * _DX[d][:, None])
+        self._body[rows, :length] = cells
+        self._occ[rows[:, None], cells] = True
+        self._head_pos[rows] = 0
+        self._size[rows] = length
+        self._length[rows] = length
+        self._dir[rows] = d
+        self._done[rows] = False
+        self._ticks[rows] = 0
+
+        self._spawn_fruits(rows)
+
+    def _spawn_fruits(self, rows: np.ndarray) -> None:
+        """Put a new fruit on a random free cell for each given game."""
+        # Games whose board is full are over
+        full = self._occ[rows].all(axis = 1)
+        self._done[rows[full]] = True
+        rows = rows[~full]
+
+        # Draw uniformly among free cells
+        r = self._rng.random((len(rows), self._nb_cells))
+        r[self._occ[rows]] = -1
+        self._fruit[rows] = r.argmax(axis = 1)
+
+    def step(self, actions: np.ndarray | None = None) -> np.ndarray:
+        """
+        Advance all games that are not over by one tick.
+
+        actions holds one index in ACTIONS per game, or NO_ACTION to keep
+        going in the same direction. Return the done flags.
+        """
+        alive = ~self._done
+        if actions is not None:
+            turn = alive & (actions != NO_ACTION)
+            self._dir[turn] = actions[turn]
+        rows = np.flatnonzero(alive)
+        if len(rows) == 0:
+            return self.done
+
+        # New heads
+        head = self._body[rows, self._head_pos[rows]]
+        d = self._dir[rows]
+        x = head % self._nb_cols + _DX[d]
+        y = head // self._nb_cols + _DY[d]
+
+        # Board exit
+        out = (x < 0) | (x >= self._nb_cols) | (y < 0) | (y >= self._nb_lines)
+        if self._gameover_on_exit:
+            dead = out
+            x = np.clip(x, 0, self._nb_cols - 1)
+            y = np.clip(y, 0, self._nb_lines - 1)
+        else:
+            dead = np.zeros(len(rows), dtype = bool)
+            x %= self._nb_cols
+            y %= self._nb_lines
+        new_head = y * self._nb_cols + x
+
+        # Slither on itself?
+        dead |= self._occ[rows, new_head]
+        self._done[rows[dead]] = True
+        self._ticks[rows] += 1
+        rows = rows[~dead]
+        new_head = new_head[~dead]
+
+        # Insert new heads
+        self._head_pos[rows] = (self._head_pos[rows] - 1) % self._nb_cells
+        self._body[rows, self._head_pos[rows]] = new_head
+        self._occ[rows, new_head] = True
+        self._size[rows] += 1
+
+        # Eat fruits
+        ate = new_head == self._fruit[rows]
+        self._length[rows[ate]] += 1
+
+        # Remove queue tiles if needed
+        trim = rows[self._size[rows] > self._length[rows]]
+        tail_pos = (self._head_pos[trim] + self._size[trim] - 1) % self._nb_cells
+        self._occ[trim, self._body[trim, tail_pos]] = False
+        self._size[trim] -= 1
+
+        # Create new fruits
+        self._spawn_fruits(rows[ate])
+
+        return self.done
@@ -0,0 +1,282 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import dataclasses
+import functools
+import json
+import os
+import platform
+import tempfile
+import timeit
+import typing
+from pathlib import Path
+
+# First party
+from .board import Board
+from .cmd_line import (
+    DEFAULT_HEIGHT,
+    DEFAULT_TILE_SIZE,
+    DEFAULT_WIDTH,
+    MAX_HEIGHT,
+    MAX_WIDTH,
+    MIN_HEIGHT,
+    MIN_WIDTH,
+    read_bench_args,
+)
+from .dir import Dir
+from .exceptions import RegressionError
+from .rng import Rng
+from .score import Score
+from .scores import Scores
+from .simulation import SK_START_LENGTH
+from .snake import DEF_BODY_COLOR, Snake
+from .tile import Tile
+from .topology import Topology
+
+if typing.TYPE_CHECKING:
+    from .renderer import Renderer
+
+# Parameters
+SIZES = ((MIN_WIDTH, MIN_HEIGHT), (DEFAULT_WIDTH, DEFAULT_HEIGHT),
+         (MAX_WIDTH, MAX_HEIGHT)) # (columns, lines)
+FILLS = (0, 25, 50, 100) # Snake length, in percents of the board
+NB_SCORES = (5, 1000)
+
+# Constants
+DEF_REPEAT = 5
+DEF_MIN_TIME = 0.05 # Minimum duration of a repeat, in seconds
+DEF_TOLERANCE = 0.25 # Accepted slowdown against the baseline
+
+Operation = typing.Callable[[], object]
+
+@dataclasses.dataclass(frozen = True)
+class Case:
+    """A benchmark: an operation to time, for given parameters."""
+
+    name: str
+    params: tuple[tuple[str, int], ...]
+    setup: typing.Callable[[], Operation] # Prepare and return the operation
+
+    @property
+    def key(self) -> str:
+        """Unique name of the benchmark, with its parameters."""
+        return f"{self.name}[{','.join(f'{k}={v}' for k, v in self.params)}]"
+
+def hamiltonian_cycle(nb_lines: int, nb_cols: int) -> list[tuple[int, int]]:
+    """
+    Get a cycle going through all cells of the board, as (x, y) coordinates.
+
+    The cycle goes along the first line, snakes through the other lines
+    without the first column, and goes back up the first column. The number
+    of lines must be even.
+    """
+    if nb_lines % 2:
+        msg = f"No such cycle with an odd number of lines ({nb_lines})."
+        raise ValueError(msg)
+    cycle = [(x, 0) for x in range(nb_cols)]
+    for y in range(1, nb_lines):
+        xs = range(nb_cols - 1, 0, -1) if y % 2 else range(1, nb_cols)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(nb_lines - 1, 0, -1))
+    return cycle
+
+def snake_length(nb_lines: int, nb_cols: int, fill: int) -> int:
+    """Length of a snake covering a percentage of the board, one cell free."""
+    cells = nb_lines * nb_cols
+    return max(SK_START_LENGTH, min(cells - 1, cells * fill // 100))
+
+def _board_with_snake(nb_lines: int, nb_cols: int,
+                      length: int) -> tuple[Board, Snake, list[Dir], int]:
+    """
+    Create a board with a snake lying along a Hamiltonian cycle.
+
+    Return the board, the snake, the direction to take from each cell of the
+    cycle, and the position of the snake's head in the cycle.
+    """
+    cycle = hamiltonian_cycle(nb_lines, nb_cols)
+    dirs = []
+    for (x, y), (nx, ny) in zip(cycle, cycle[1:] + cycle[:1], strict = True):
+        dirs.append(Dir((nx - x, ny - y)))
+    tiles = [Tile.get(x, y, DEF_BODY_COLOR)
+             for x, y in reversed(cycle[:length])]
+    snake = Snake(tiles, dirs[length - 1],
+                  topology = Topology.get(nb_lines, nb_cols, wrap = True))
+    board = Board(nb_lines = nb_lines, nb_cols = nb_cols, rng = Rng(0))
+    board.add_object(snake)
+    return board, snake, dirs, length - 1
+
+def _snake_move(nb_lines: int, nb_cols: int, length: int) -> Operation:
+    """Move the snake one cell forward, along the cycle."""
+    _, snake, dirs, head = _board_with_snake(nb_lines, nb_cols, length)
+    pos = [head]
+
+    def op() -> None:
+        snake.dir = dirs[pos[0]]
+        snake.move()
+        pos[0] = (pos[0] + 1) % len(dirs)
+
+    return op
+
+def _board_collides(nb_lines: int, nb_cols: int, length: int) -> Operation:
+    """Look for the objects colliding with the snake."""
+    board, snake, _, _ = _board_with_snake(nb_lines, nb_cols, length)
+    return lambda: list(board.collides(snake))
+
+def _board_create_fruit(nb_lines: int, nb_cols: int,
+                        length: int) -> Operation:
+    """Create a fruit, then remove it."""
+    board, snake, _, _ = _board_with_snake(nb_lines, nb_cols, length)
+
+    def op() -> None:
+        board.create_fruit()
+        for obj in list(board.objects):
+            if obj is not snake:
+                board.remove_object(obj)
+
+    return op
+
+def _renderer(nb_lines: int, nb_cols: int) -> "Renderer":
+    """
+    Create a renderer drawing on the display.
+
+    Unless told otherwise, SDL uses its dummy video driver, which needs no
+    display.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame # noqa: PLC0415
+
+    from .renderer import Renderer # noqa: PLC0415
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((nb_cols * DEFAULT_TILE_SIZE,
+                                      nb_lines * DEFAULT_TILE_SIZE))
+    return Renderer(screen, tile_size = DEFAULT_TILE_SIZE)
+
+def _checkerboard(nb_lines: int, nb_cols: int) -> Operation:
+    """Render the checkerboard background, alternating its colors."""
+    renderer = _renderer(nb_lines, nb_cols)
+    board = Board(nb_lines = nb_lines, nb_cols = nb_cols)
+    colors = (renderer.bg_colors, renderer.bg_colors[::-1])
+    count = [0]
+
+    def op() -> None:
+        count[0] += 1
+        renderer.bg_colors = colors[count[0] % 2]
+        renderer.draw(board)
+
+    return op
+
+def _board_draw(nb_lines: int, nb_cols: int, length: int) -> Operation:
+    """Draw the whole board, with its cached background."""
+    board, _, _, _ = _board_with_snake(nb_lines, nb_cols, length)
+    renderer = _renderer(nb_lines, nb_cols)
+    return lambda: renderer.draw(board)
+
+def _scores(nb: int) -> tuple[Scores, Path]:
+    """Create scores, and save them to a temporary file."""
+    rng = Rng(0)
+    scores = Scores(nb, [Score(name = f"P{i}", score = rng.randint(0, 9999))
+                         for i in range(nb)])
+    path = Path(tempfile.gettempdir()) / f"snake-bench-{nb}.yml"
+    scores.save(path)
+    return scores, path
+
+def _scores_save(nb: int) -> Operation:
+    """Save the scores to a file."""
+    scores, path = _scores(nb)
+    return lambda: scores.save(path)
+
+def _scores_load(nb: int) -> Operation:
+    """Load the scores from a file."""
+    _, path = _scores(nb)
+    return lambda: Scores.load(path, nb)
+
+def cases() -> typing.Iterator[Case]:
+    """Generate all benchmarks."""
+    for nb_cols, nb_lines in SIZES:
+        size = (("cols", nb_cols), ("lines", nb_lines))
+        for fill in FILLS:
+            length = snake_length(nb_lines, nb_cols, fill)
+            params = (*size, ("length", length))
+            for name, setup in (("snake.move", _snake_move),
+                                ("board.collides", _board_collides),
+                                ("board.create_fruit", _board_create_fruit),
+                                ("board.draw", _board_draw)):
+                yield Case(name, params, functools.partial(
+                        setup, nb_lines, nb_cols, length))
+        yield Case("checkerboard.draw", size,
+                   functools.partial(_checkerboard, nb_lines, nb_cols))
+    for nb in NB_SCORES:
+        yield Case("scores.save", (("scores", nb),),
+                   functools.partial(_scores_save, nb))
+        yield Case("scores.load", (("scores", nb),),
+                   functools.partial(_scores_load, nb))
+
+def measure(op: Operation, repeat: int = DEF_REPEAT,
+            min_time: float = DEF_MIN_TIME) -> tuple[float, int]:
+    """
+    Time an operation.
+
+    The operation is run in loops long enough to last min_time, and the best
+    of repeat loops is kept. Return the time of one operation, in seconds,
+    and the number of operations per loop.
+    """
+    timer = timeit.Timer(op)
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        number *= 2
+    best = min([elapsed, *timer.repeat(repeat - 1, number)])
+    return best / number, number
+
+def run(selected: typing.Iterable[Case], repeat: int = DEF_REPEAT,
+        min_time: float = DEF_MIN_TIME,
+        ) -> dict[str, dict[str, typing.Any]]:
+    """Run benchmarks, and get their results by key."""
+    results = {}
+    for case in selected:
+        seconds, number = measure(case.setup(), repeat, min_time)
+        results[case.key] = {"name": case.name, "params": dict(case.params),
+                             "seconds": seconds, "number": number}
+    return results
+
+def compare(results: dict[str, dict[str, typing.Any]],
+            baseline: dict[str, dict[str, typing.Any]],
+            tolerance: float = DEF_TOLERANCE,
+            ) -> list[tuple[str, float]]:
+    """
+    Compare results to a baseline.
+
+    Return the ratio of time to the baseline of each benchmark that is more
+    than `tolerance` slower. Benchmarks missing from either side are ignored.
+    """
+    return [(key, result["seconds"] / baseline[key]["seconds"])
+            for key, result in results.items()
+            if key in baseline and result["seconds"]
+            > baseline[key]["seconds"] * (1 + tolerance)]
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmarks from the command line."""
+    args = read_bench_args(argv)
+    selected = [c for c in cases()
+                if args.filter is None or args.filter in c.key]
+    results: dict[str, dict[str, typing.Any]] = {}
+    for case in selected:
+        results |= run([case], args.repeat, args.min_time)
+        print(f"{case.key:<56}" # noqa: T201
+              f"{results[case.key]['seconds'] * 1e6:12.2f} us")
+
+    # Machine-readable results
+    if args.output is not None:
+        Path(args.output).write_text(json.dumps(
+                {"python": platform.python_version(),
+                 "machine": platform.machine(), "results": results},
+                indent = 2))
+
+    # Check for regressions
+    if args.baseline is not None:
+        baseline = json.loads(Path(args.baseline).read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, ratio in regressions:
+            print(f"REGRESSION {key}: {ratio:.2f}x the baseline") # noqa: T201
+        if regressions:
+            raise RegressionError(len(regressions), args.tolerance)
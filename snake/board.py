@@ -3,28 +3,80 @@
 # Standard
 import typing
 
-# Third party
-import pygame
-
 # First party
+from .color import Color
+from .exceptions import CAUSE_FULL, GameOver
 from .fruit import Fruit
 from .game_object import GameObject
 from .observer import Observer
+from .rng import Rng
 from .subject import Subject
+from .tile import Tile
 
 
 class Board(Subject, Observer):
-    """Main class that handles all game objects."""
-
-    def __init__(self, screen: pygame.Surface, nb_lines: int, nb_cols: int,
-                 tile_size: int) -> None:
+    """
+    Main class that handles all game objects.
+
+    The board keeps an occupancy grid telling which object covers each cell,
+    so collisions are found by looking up cells instead of comparing objects
+    with each other. Background objects are not put in the grid.
+
+    The free cells are indexed too, in an array with a map from each cell to
+    its position in the array. A cell is added by appending it and removed by
+    swapping it with the last one, and a fruit position is drawn uniformly
+    from the array, whatever the board occupancy.
+
+    Optionally, the board also records the cells whose content changed (the
+    dirty cells), so a renderer can redraw only those.
+    """
+
+    def __init__(self, nb_lines: int, nb_cols: int,
+                 fruit_color: Color | None = None,
+                 rng: Rng | None = None,
+                 *,
+                 track_dirty: bool = False) -> None:
         """Object initialization."""
         super().__init__()
-        self._screen = screen
         self._nb_lines = nb_lines
         self._nb_cols = nb_cols
-        self._tile_size = tile_size
+        self._fruit_color = fruit_color
         self._objects: list[GameObject] = []
+        self._grid: list[GameObject | None] = [None] * (nb_lines * nb_cols)
+        self._free = list(range(nb_lines * nb_cols))
+        self._free_pos = self._free.copy()
+        self._rng = Rng() if rng is None else rng
+        self._dirty: dict[int, Tile | None] | None = (
+                {} if track_dirty else None)
+
+    @property
+    def nb_lines(self) -> int:
+        """Number of lines of the board."""
+        return self._nb_lines
+
+    @property
+    def nb_cols(self) -> int:
+        """Number of columns of the board."""
+        return self._nb_cols
+
+    @property
+    def objects(self) -> typing.Iterator[GameObject]:
+        """Iterator on the objects of the board."""
+        return iter(self._objects)
+
+    def pop_dirty(self) -> dict[tuple[int, int], Tile | None]:
+        """
+        Get and forget the cells that changed since the last call.
+
+        Map the (x, y) coordinates of each dirty cell to the tile now covering
+        it, or to None if the cell is free.
+        """
+        if not self._dirty:
+            return {}
+        dirty = {(cell % self._nb_cols, cell // self._nb_cols): tile
+                 for cell, tile in self._dirty.items()}
+        self._dirty.clear()
+        return dirty
 
     def add_object(self, obj: GameObject) -> None:
         """Add an object to the board."""
@@ -32,6 +84,9 @@ class Board(Subject, Observer):
         if obj not in self._objects:
             self._objects.append(obj)
             obj.attach_obs(self)
+            if not obj.is_background():
+                for tile in obj.tiles:
+                    self._occupy(tile, obj)
 
     def remove_object(self, obj: GameObject) -> None:
         """Remove an object from the board."""
@@ -39,22 +94,61 @@ class Board(Subject, Observer):
         if obj in self._objects:
             self._objects.remove(obj)
             obj.detach_obs(self)
+            if not obj.is_background():
+                for tile in obj.tiles:
+                    self._release(tile, obj)
+
+    def _cell(self, tile: Tile) -> int | None:
+        """Index of the grid cell of a tile, or None if outside the board."""
+        if 0 <= tile.x < self._nb_cols and 0 <= tile.y < self._nb_lines:
+            return tile.y * self._nb_cols + tile.x
+        return None
+
+    def _occupy(self, tile: Tile, obj: GameObject) -> GameObject | None:
+        """Mark a tile as covered by an object, and return its former owner."""
+        cell = self._cell(tile)
+        if cell is None:
+            return None
+        former = self._grid[cell]
+        self._grid[cell] = obj
+        if former is None:
+            self._remove_free(cell)
+        if self._dirty is not None:
+            self._dirty[cell] = tile
+        return former
+
+    def _release(self, tile: Tile, obj: GameObject) -> None:
+        """Mark a tile as free, if it is covered by the object."""
+        cell = self._cell(tile)
+        if cell is not None and self._grid[cell] is obj:
+            self._grid[cell] = None
+            self._free_pos[cell] = len(self._free)
+            self._free.append(cell)
+            if self._dirty is not None:
+                self._dirty[cell] = None
+
+    def _remove_free(self, cell: int) -> None:
+        """Remove a cell from the free cells, by swapping it with the last."""
+        pos = self._free_pos[cell]
+        last = self._free.pop()
+        if last != cell:
+            self._free[pos] = last
+            self._free_pos[last] = pos
 
     def create_fruit(self) -> None:
-        """Create a random fruit."""
-        fruit = None
-        while fruit is None or list(self.collides(fruit)):
-            fruit = Fruit.create_random(self._nb_lines, self._nb_cols)
-        self.add_object(fruit)
+        """Create a fruit on a random free cell."""
+        # The board is full, the game cannot go on
+        if not self._free:
+            raise GameOver(CAUSE_FULL)
 
-    def draw(self) -> None:
-        """Draw all objects on screen."""
-        # Loop on all objects
-        for obj in self._objects:
+        y, x = divmod(self._free[self._rng.index(len(self._free))],
+                      self._nb_cols)
+        self.place_fruit(x, y)
 
-            # Loop on all object's tiles
-            for tile in obj.tiles:
-                tile.draw(self._screen, self._tile_size)
+    def place_fruit(self, x: int, y: int) -> None:
+        """Create a fruit on a given cell."""
+        color = Fruit.color if self._fruit_color is None else self._fruit_color
+        self.add_object(Fruit(Tile.get(x, y, color)))
 
     def notify_object_eaten(self, obj: GameObject) -> None:
         """Notify that the fruit has been eaten."""
@@ -67,22 +161,42 @@ class Board(Subject, Observer):
 
     def notify_object_moved(self, obj: GameObject) -> None:
         """Notify that an object has moved."""
-        # Detect board exit
-        for tile in obj.tiles:
-            if not (0 <= tile.x < self._nb_cols and
-                    0 <= tile.y < self._nb_lines):
-                obj.notify_out_of_board(width = self._nb_cols,
-                                        height = self._nb_lines)
+        # Detect board exit, only the leading tile may have exited
+        head = next(obj.tiles)
+        if not (0 <= head.x < self._nb_cols and 0 <= head.y < self._nb_lines):
+            obj.notify_out_of_board(width = self._nb_cols,
+                                    height = self._nb_lines)
+
+        # Only the leading tile has entered a new cell
+        tiles = obj.tiles
+        former = self._occupy(next(tiles), obj)
+
+        # The tile behind may have changed look (e.g.: the snake's former
+        # head)
+        if self._dirty is not None:
+            behind = next(tiles, None)
+            cell = None if behind is None else self._cell(behind)
+            if cell is not None:
+                self._dirty[cell] = behind
 
         # Detect collisions
-        for o in self.collides(obj):
-            obj.notify_collision(o)
+        if former is not None and former is not obj:
+            obj.notify_collision(former)
+
+    def notify_tile_freed(self, obj: GameObject, tile: Tile) -> None:
+        """Notify that an object does not cover a tile anymore."""
+        self._release(tile, obj)
 
     def collides(self, obj: GameObject) -> typing.Iterator[GameObject]:
         """Check if an object collides with other objects on the board."""
-        # Loop on all known objects
-        for o in self._objects:
+        found: list[GameObject] = []
+
+        # Look up the cells covered by the object
+        for tile in obj.tiles:
+            cell = self._cell(tile)
+            o = self._grid[cell] if cell is not None else None
 
             # Detect a collision
-            if obj != o and not o.is_background() and obj in o:
+            if o is not None and o is not obj and o not in found:
+                found.append(o)
                 yield o
@@ -3,25 +3,26 @@
 # Standard
 import typing
 
-# Third party
-import pygame
-
 # First party
+from .color import Color
 from .game_object import GameObject
 from .tile import Tile
 
 # Colors
-CB_COLOR_1 = pygame.Color("White")
-CB_COLOR_2 = pygame.Color("Black")
+CB_COLOR_1: Color = (255, 255, 255)
+CB_COLOR_2: Color = (0, 0, 0)
 
 class Checkerboard(GameObject):
     """The black and white checkerboard used as background."""
 
-    def __init__(self, nb_lines: int, nb_cols: int) -> None:
+    def __init__(self, nb_lines: int, nb_cols: int,
+                 colors: tuple[Color, Color] = (CB_COLOR_1, CB_COLOR_2),
+                 ) -> None:
         """Object initialization."""
         super().__init__()
         self._nb_lines = nb_lines
         self._nb_cols = nb_cols
+        self._colors = colors
 
     @property
     def tiles(self) -> typing.Iterator[Tile]:
@@ -31,7 +32,7 @@ class Checkerboard(GameObject):
             for j in range(self._nb_lines):
 
                 # Generate the tile with the right color
-                yield Tile(i, j, CB_COLOR_1 if (i+j) % 2 == 0 else CB_COLOR_2)
+                yield Tile.get(i, j, self._colors[(i+j) % 2])
 
     def is_background(self) -> bool:
         """Test if this object is a background object."""
@@ -3,11 +3,10 @@
 # Standard
 import argparse
 import re
-
-# Third party
-import pygame
+import sys
 
 # First party
+from .backends import BACKENDS
 from .exceptions import ColorError, IntRangeError
 
 # Global constants
@@ -23,19 +22,19 @@ MIN_TILE_SIZE = 10
 MAX_TILE_SIZE = 30
 MIN_FPS = 10
 MAX_FPS = 30
+MAX_REPLAY_FPS = 1000
+DEFAULT_RENDER_FPS = 60
+MAX_RENDER_FPS = 240
+RENDERERS = ("tiles", "numpy")
+DEFAULT_RENDERER = "tiles"
 
-# Snake constants
-SK_DEF_HEAD_COLOR = pygame.Color("Green2") # Snake's head default color
-SK_DEF_BODY_COLOR = pygame.Color("GreenYellow") # Snake's body default color
-SK_DEF_HEAD_COLOR_HEX = (f"#{SK_DEF_HEAD_COLOR.r:02x}{SK_DEF_HEAD_COLOR.g:02x}"
-                     f"{SK_DEF_HEAD_COLOR.b:02x}")
-SK_DEF_BODY_COLOR_HEX = (f"#{SK_DEF_BODY_COLOR.r:02x}{SK_DEF_BODY_COLOR.g:02x}"
-                     f"{SK_DEF_BODY_COLOR.b:02x}")
+# Snake constants, as HTML colors so that pygame is not needed to read the
+# command line
+SK_DEF_HEAD_COLOR_HEX = "#00ee00" # Snake's head default color (Green2)
+SK_DEF_BODY_COLOR_HEX = "#adff2f" # Snake's body default color (GreenYellow)
 
 # Fruit constants
-FRUIT_DEF_COLOR = pygame.Color("Red3") # Fruit default color
-FRUIT_DEF_COLOR_HEX = (f"#{FRUIT_DEF_COLOR.r:02x}{FRUIT_DEF_COLOR.g:02x}"
-                       f"{FRUIT_DEF_COLOR.b:02x}")
+FRUIT_DEF_COLOR_HEX = "#cd0000" # Fruit default color (Red3)
 
 def read_args() -> argparse.Namespace:
     """Read command line arguments."""
@@ -64,18 +63,56 @@ def read_args() -> argparse.Namespace:
     parser.add_argument("--snake-body-color", default = SK_DEF_BODY_COLOR_HEX,
                         help="Color of the snake's body.")
 
+    # Rendering
+    parser.add_argument("--renderer", choices = RENDERERS,
+                        default = DEFAULT_RENDERER,
+                        help="How to draw the board: one rectangle per tile,"
+                        " or a NumPy palette grid scaled in one blit (needs"
+                        " numpy).")
+
     # Game options
     parser.add_argument("--gameover-on-exit", action = "store_true",
                         help="Exiting the board ends the game.")
 
     # FPS
     parser.add_argument("--fps", type = int, default = DEFAULT_FPS,
-                        help="Set the number of frames per second."
-                        f" Must be between {MIN_FPS} and {MAX_FPS}.")
+                        help="Set the speed of the game, in moves per"
+                        f" second. Must be between {MIN_FPS} and {MAX_FPS}.")
+    parser.add_argument("--render-fps", type = int,
+                        default = DEFAULT_RENDER_FPS,
+                        help="Number of frames drawn per second, whatever the"
+                        f" game speed. Must be between {MIN_FPS} and"
+                        f" {MAX_RENDER_FPS}.")
+    parser.add_argument("--sim-thread", action = "store_true",
+                        help="Run the game in a separate thread, so that"
+                        " slow drawing does not delay its moves.")
+
+    # Randomness & replays
+    parser.add_argument("--seed", type = int, default = None,
+                        help="Seed of the random number generator, to replay"
+                        " the same games. Drawn at random by default.")
+    parser.add_argument("--record", type = str, default = None, metavar = "DIR",
+                        help="Directory where to save a replay of each game.")
+
+    # Profiling
+    parser.add_argument("--profile", action = "store_true",
+                        help="Time each phase of the frames, and print"
+                        " statistics on exit.")
+    parser.add_argument("--profile-overlay", action = "store_true",
+                        help="Display the frame timings over the game"
+                        " (implies --profile).")
+    parser.add_argument("--profile-stats", type = str, default = None,
+                        metavar = "FILE",
+                        help="Profile the game with cProfile, and dump the"
+                        " statistics to this file on exit.")
 
     #scores
     parser.add_argument("--scores_file", type=str, default = "snake_score.yml",
                         help="path of the score file")
+    parser.add_argument("--scores-backend", choices = BACKENDS, default = None,
+                        help="Storage of the scores: a YAML file of the best"
+                        " scores, or an SQLite database of all games. Defaults"
+                        " to SQLite for *.db, *.sqlite and *.sqlite3 files.")
 
     # Parse
     args = parser.parse_args()
@@ -90,6 +127,8 @@ def read_args() -> argparse.Namespace:
                  "min": MIN_HEIGHT, "max": MAX_HEIGHT},
                 {"lbl": "FPS", "val": args.fps,
                  "min": MIN_FPS, "max": MAX_FPS},
+                {"lbl": "Render FPS", "val": args.render_fps,
+                 "min": MIN_FPS, "max": MAX_RENDER_FPS},
                 ]:
         if not (chk["min"] <= chk["val"] <= chk["max"]):
             raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
@@ -103,3 +142,154 @@ def read_args() -> argparse.Namespace:
     # Run parser on command line arguments
     return args
 
+def _agent(text: str) -> tuple[str, str]:
+    """Parse an agent given as NAME=module:function."""
+    name, sep, spec = text.partition("=")
+    if not sep or ":" not in spec:
+        msg = f'Agent "{text}" must be given as NAME=module:function.'
+        raise argparse.ArgumentTypeError(msg)
+    return name, spec
+
+def _seeds(text: str) -> list[int]:
+    """Parse a seed or an inclusive range of seeds FIRST-LAST."""
+    first, _, last = text.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+def read_tournament_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Read command line arguments of the tournament command."""
+    # Create parser & set description
+    parser = argparse.ArgumentParser(
+            prog = "snake tournament",
+            description = "Play headless games with autopilot agents.",
+            formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    # Agents & seeds
+    parser.add_argument("--agent", "-a", type = _agent, action = "append",
+                        default = None,
+                        help="An agent, as NAME=module:function. The function"
+                        " receives the snake.Simulation and returns the next"
+                        " snake.Dir, or None to go straight. May be repeated."
+                        " Defaults to the built-in greedy agent.")
+    parser.add_argument("--seeds", "-s", type = _seeds, nargs = "+",
+                        default = [list(range(10))],
+                        help="Seeds of the games to play, as single values or"
+                        " FIRST-LAST ranges. Each agent plays every seed.")
+
+    # Checkerboard arguments
+    parser.add_argument("--height", "-H", type = int, default = DEFAULT_HEIGHT,
+                        help="Number of lines of the checkerboard."
+                        f" Must be between {MIN_HEIGHT} and {MAX_HEIGHT}.")
+    parser.add_argument("--width", "-W", type = int, default = DEFAULT_WIDTH,
+                        help="Number of columns of the checkerboard."
+                        f" Must be between {MIN_WIDTH} and {MAX_WIDTH}.")
+
+    # Game options
+    parser.add_argument("--gameover-on-exit", action = "store_true",
+                        help="Exiting the board ends the game.")
+    parser.add_argument("--max-ticks", type = int, default = 100_000,
+                        help="Stop a game after this number of ticks.")
+
+    # Execution
+    parser.add_argument("--workers", "-j", type = int, default = None,
+                        help="Number of worker processes. Defaults to the"
+                        " number of CPUs.")
+    parser.add_argument("--quiet", "-q", action = "store_true",
+                        help="Only print the final leaderboard.")
+
+    #scores
+    parser.add_argument("--scores_file", type=str, default = None,
+                        help="path of a score file where to save the"
+                        " leaderboard")
+
+    # Parse
+    args = parser.parse_args(argv)
+    if args.agent is None:
+        args.agent = [("greedy", "snake.tournament:greedy")]
+    args.seeds = [seed for seeds in args.seeds for seed in seeds]
+
+    # Check integer range
+    for chk in [{"lbl": "Width", "val": args.width,
+                 "min": MIN_WIDTH, "max": MAX_WIDTH},
+                {"lbl": "Height", "val": args.height,
+                 "min": MIN_HEIGHT, "max": MAX_HEIGHT},
+                ]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return args
+
+def read_replay_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Read command line arguments of the replay command."""
+    # Create parser & set description
+    parser = argparse.ArgumentParser(
+            prog = "snake replay",
+            description = "Play recorded games again.",
+            formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("replays", nargs = "+", metavar = "REPLAY",
+                        help="Replay files.")
+    parser.add_argument("--headless", action = "store_true",
+                        help="Simulate at maximum speed without any display,"
+                        " e.g. to verify scores.")
+    parser.add_argument("--fps", type = int, default = DEFAULT_FPS,
+                        help="Number of ticks per second when displayed.")
+    parser.add_argument("--tile-size", "-T", type = int,
+                        default = DEFAULT_TILE_SIZE,
+                        help=f"Tile size, in pixels. Must be between"
+                        f" {MIN_TILE_SIZE} and {MAX_TILE_SIZE}.")
+
+    # Parse
+    args = parser.parse_args(argv)
+
+    # Check integer range
+    for chk in [{"lbl": "Tile size", "val": args.tile_size,
+                 "min": MIN_TILE_SIZE, "max": MAX_TILE_SIZE},
+                {"lbl": "FPS", "val": args.fps,
+                 "min": 1, "max": MAX_REPLAY_FPS},
+                ]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return args
+
+def read_bench_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Read command line arguments of the bench command."""
+    # Create parser & set description
+    parser = argparse.ArgumentParser(
+            prog = "snake bench",
+            description = "Time the simulation and rendering hot paths.",
+            formatter_class = argparse.ArgumentDefaultsHelpFormatter)
+
+    parser.add_argument("--filter", "-k", type = str, default = None,
+                        help="Only run the benchmarks whose name, with its"
+                        " parameters, contains this text.")
+    parser.add_argument("--repeat", "-r", type = int, default = 5,
+                        help="Number of timed loops, of which the best is"
+                        " kept.")
+    parser.add_argument("--min-time", type = float, default = 0.05,
+                        help="Minimum duration of a timed loop, in seconds.")
+
+    # Results
+    parser.add_argument("--output", "-o", type = str, default = None,
+                        metavar = "FILE",
+                        help="JSON file where to write the results, e.g. to"
+                        " be used as a baseline.")
+    parser.add_argument("--baseline", "-b", type = str, default = None,
+                        metavar = "FILE",
+                        help="JSON results to compare with. Fail if a"
+                        " benchmark is slower by more than the tolerance.")
+    parser.add_argument("--tolerance", type = float, default = 0.25,
+                        help="Accepted slowdown against the baseline, as a"
+                        " fraction.")
+
+    # Parse
+    args = parser.parse_args(argv)
+
+    # Check integer range
+    for chk in [{"lbl": "Repeat", "val": args.repeat,
+                 "min": 1, "max": sys.maxsize},
+                ]:
+        if not (chk["min"] <= chk["val"] <= chk["max"]):
+            raise IntRangeError(chk["lbl"], chk["val"], chk["min"], chk["max"])
+
+    return args
@@ -0,0 +1,14 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import typing
+
+# A color value, in any form accepted by pygame (name, "#rrggbb" string, RGB
+# tuple or pygame.Color). Gameplay classes only carry colors around, they
+# never interpret them, so pygame is not needed at run time.
+if typing.TYPE_CHECKING:
+    import pygame
+
+    Color: typing.TypeAlias = str | tuple[int, int, int] | pygame.Color
+else:
+    Color = str | tuple[int, int, int]
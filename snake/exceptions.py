@@ -7,12 +7,18 @@ class SnakeException(Exception): # noqa: N818
         """Object initialization."""
         super().__init__(msg)
 
+# Causes of game over
+CAUSE_SELF = "self" # The snake slithered on itself
+CAUSE_EXIT = "exit" # The snake exited the board
+CAUSE_FULL = "full" # The snake filled the whole board
+
 class GameOver(SnakeException):
     """Exception class used to signal game over."""
 
-    def __init__(self) -> None:
+    def __init__(self, cause: str = CAUSE_SELF) -> None:
         """Object initialization."""
         super().__init__("Game over!")
+        self.cause = cause
 
 class SnakeError(Exception):
     """Exception super-class for all Snake errors."""
@@ -29,6 +35,25 @@ class IntRangeError(SnakeError):
         super().__init__(f"{label} value must be between {low} and {high}."
                          f" {value} is not allowed.")
 
+class DependencyError(SnakeError):
+    """Exception for a missing optional dependency."""
+
+    def __init__(self, feature: str, package: str) -> None:
+        """Object initialization."""
+        super().__init__(f"{feature} requires the {package} package, which is"
+                         " not installed.")
+
+class ReplayError(SnakeError):
+    """Exception for a malformed replay."""
+
+class RegressionError(SnakeError):
+    """Exception for benchmarks slower than their baseline."""
+
+    def __init__(self, count: int, tolerance: float) -> None:
+        """Object initialization."""
+        super().__init__(f"{count} benchmark(s) more than {tolerance:.0%}"
+                         " slower than the baseline.")
+
 class ColorError(SnakeError):
     """Exception for color format error."""
 
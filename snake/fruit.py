@@ -4,18 +4,17 @@
 import random
 import typing
 
-# Third party
-import pygame
-
 # First party
+from .color import Color
 from .game_object import GameObject
+from .rng import Rng
 from .tile import Tile
 
 
 class Fruit(GameObject):
     """A fruit that the snake must eat."""
 
-    color = pygame.Color("black")
+    color: Color = (0, 0, 0)
 
     def __init__(self, tile: Tile) -> None:
         """Object initialization."""
@@ -33,9 +32,12 @@ class Fruit(GameObject):
 
     # Create a Fruit at random position on the board
     @classmethod
-    def create_random(cls, nb_lines: int, nb_cols: int) -> typing.Self:
+    def create_random(cls, nb_lines: int, nb_cols: int,
+                      color: Color | None = None,
+                      rng: random.Random | None = None) -> typing.Self:
         """Create a random fruit."""
-        random.seed()
-        x = random.randint(0, nb_cols - 1)
-        y = random.randint(0, nb_lines - 1)
-        return cls(Tile(x, y, cls.color))
+        if rng is None:
+            rng = Rng()
+        x = rng.randint(0, nb_cols - 1)
+        y = rng.randint(0, nb_lines - 1)
+        return cls(Tile.get(x, y, cls.color if color is None else color))
@@ -1,68 +1,148 @@
 # ruff: noqa: D100,S311
 
 # Third party
+import collections
+import concurrent.futures
+import contextlib
+import datetime
 import importlib.resources
+import io
 from pathlib import Path
 
 import pygame
 
 # First party
-from .board import Board
-from .checkerboard import Checkerboard
+from .color import Color
 from .dir import Dir
-from .exceptions import GameOver
-from .fruit import Fruit
+from .exceptions import DependencyError
+from .profiler import FrameProfiler
+from .renderer import Renderer
+from .replay import SUFFIX, Recorder
 from .score import Score
+from .score_store import GameRecord, ScoreStore, open_score_store
+from .score_writer import ScoreWriter
 from .scores import Scores
-from .snake import Snake
+from .sim_worker import SimulationWorker
+from .simulation import Simulation
 from .state import State
+from .text_cache import TextCache
 
-# Constants
-SK_START_LENGTH = 3
+# Fonts
+FONT_FILE = "DejaVuSansMono-Bold.ttf"
+SCORE_FONT_SIZE = 32
+GAMEOVER_FONT_SIZE = 64
+TEXT_COLOR = "red"
+
+# Game clock
+TURN_QUEUE_SIZE = 3 # Turns buffered for the next ticks
+MAX_TICKS_PER_FRAME = 5 # Ticks played at most to catch up with the clock
+
+# Idle screens, drawn again only when something happens
+IDLE_STATES = (State.SCORES, State.INPUT_NAME)
+IDLE_TIMEOUT = 1000 # Longest wait for an event, in milliseconds
+REDRAW_EVENTS = frozenset((pygame.KEYDOWN, pygame.WINDOWEXPOSED,
+                           pygame.VIDEOEXPOSE))
+
+# Score table
+SCORES_POS = (80, 10)
+SCORES_LINE_HEIGHT = 32
+
+# Profiler overlay
+OVERLAY_FONT_SIZE = 12
+OVERLAY_COLOR = pygame.Color("white")
+OVERLAY_BG_COLOR = pygame.Color("black")
 
 class Game:
-    """The main class of the game."""
+    """
+    The main class of the game.
+
+    The game advances at a fixed number of ticks per second (fps), whatever
+    the number of frames drawn per second (render_fps, which defaults to fps).
+    Turns typed between two ticks are queued, and the snake takes one per
+    tick, so that quick sequences of keys are not lost.
+
+    Optionally, the simulation runs in a worker thread, and the game loop only
+    processes events and draws the snapshots the worker publishes, so that a
+    slow display does not delay the ticks.
+    """
 
     def __init__(self, width: int, height: int, tile_size: int, # noqa: PLR0913
                  fps: int,
                  *,
-                 fruit_color: pygame.Color,
-                 snake_head_color: pygame.Color,
-                 snake_body_color: pygame.Color,
+                 render_fps: int | None = None,
+                 fruit_color: Color,
+                 snake_head_color: Color,
+                 snake_body_color: Color,
                  gameover_on_exit: bool,
                  score_file: Path,
+                 renderer: str = "tiles",
+                 scores_backend: str | None = None,
+                 seed: int | None = None,
+                 record_dir: Path | None = None,
+                 profile: bool = False,
+                 profile_overlay: bool = False,
+                 profile_stats: Path | None = None,
+                 sim_thread: bool = False,
                  ) -> None:
         """Object initialization."""
         self._width = width
         self._height = height
         self._tile_size = tile_size
         self._fps = fps
+        self._render_fps = fps if render_fps is None else render_fps
+        self._tick_time = 1000 / fps # In milliseconds
+        self._lag = 0.0 # Time the simulation is late on the clock
+        self._countdown = 0 # Frames left on the game over screen
         self._fruit_color = fruit_color
         self._snake_head_color = snake_head_color
         self._snake_body_color = snake_body_color
         self._gameover_on_exit = gameover_on_exit
-        self._snake = None
+        self._turns: collections.deque[Dir] = collections.deque()
+        self._sim_thread = sim_thread
+        self._worker: SimulationWorker | None = None
         self._new_high_score=None | Score
+        self._placed: tuple[int, int] | None = None # Rank & number of scores
         self._score_file=score_file
-
-    def _reset_snake(self) -> None:
-        if self._snake is not None:
-            self._board.detach_obs(self._snake)
-            self._board.remove_object(self._snake)
-        self._snake = Snake.create_random(
-                nb_lines = self._height,
-                nb_cols = self._width,
-                length = SK_START_LENGTH,
-                head_color = self._snake_head_color,
-                body_color = self._snake_body_color,
-                gameover_on_exit = self._gameover_on_exit,
-                )
-        self._board.add_object(self._snake)
-        self._board.attach_obs(self._snake)
+        self._renderer_name = renderer
+        self._scores_backend = scores_backend
+        self._seed = seed
+        self._record_dir = record_dir
+        self._recorder: Recorder | None = None
+        self._profiler = FrameProfiler(budget = 1 / self._render_fps,
+                                       enabled = profile or profile_overlay,
+                                       stats_file = profile_stats)
+        self._profile_overlay = profile_overlay
+        self._overlay: pygame.Surface | None = None
+        self._font_data: bytes | None = None
+        self._fonts: dict[int, pygame.font.Font] = {}
+        self._text = TextCache()
+        self._score_table: pygame.Surface | None = None
+        self._score_table_key: tuple[object, ...] | None = None
 
     def _init(self) -> None:
         """Initialize the game."""
+        # Load the scores while the window is being created
+        with concurrent.futures.ThreadPoolExecutor(max_workers = 1) as pool:
+            scores = pool.submit(self._load_scores)
+            self._init_display()
+            self._score_store, self._scores = scores.result()
+        self._score_writer = ScoreWriter(self._score_store)
+
+        # Run the simulation in its own thread
+        if self._sim_thread:
+            self._worker = SimulationWorker(self._sim, self._fps,
+                                            step = self._step,
+                                            queue_size = TURN_QUEUE_SIZE)
+
+    def _load_scores(self) -> tuple[ScoreStore, Scores]:
+        """Open the score storage, and load the scores."""
+        store = open_score_store(self._score_file, self._scores_backend)
+        return store, store.load()
+
+    def _init_display(self) -> None:
+        """Create the window, and the objects needed to draw the game."""
         # Create a display screen
+        pygame.display.init()
         screen_size = (self._width * self._tile_size,
                        self._height * self._tile_size)
         self._screen = pygame.display.set_mode(screen_size)
@@ -70,59 +150,137 @@ class Game:
         # Create the clock
         self._clock = pygame.time.Clock()
 
-        # Create the main board
-        self._board = Board(screen = self._screen,
-                            nb_lines = self._height,
-                            nb_cols = self._width,
-                            tile_size = self._tile_size)
-
-        # Create checkerboard
-        self._checkerboard = Checkerboard(nb_lines = self._height,
-                                          nb_cols = self._width)
-        self._board.add_object(self._checkerboard)
-
-        # Create snake
-        self._reset_snake()
-
-        #Best Scores
-        if self._score_file.exists():
-            self._scores = Scores.load(self._score_file)
-        else:
-            self._scores = Scores.default(5)
-            self._scores.save(self._score_file)
-
-        # Create fruit
-        Fruit.color = self._fruit_color
-        self._board.create_fruit()
-
-        #Upload fonts
-        with importlib.resources.path("snake", "DejaVuSansMono-Bold.ttf") as f:
-            self._fontscore = pygame.font.Font(f, 32)
-            self._fontgameover = pygame.font.Font(f, 64)
+        # Create the renderer
+        self._renderer = self._create_renderer()
+
+        # Create the simulation (board, snake and fruit)
+        self._sim = Simulation(nb_lines = self._height,
+                               nb_cols = self._width,
+                               track_dirty = not self._sim_thread,
+                               fruit_color = self._fruit_color,
+                               snake_head_color = self._snake_head_color,
+                               snake_body_color = self._snake_body_color,
+                               gameover_on_exit = self._gameover_on_exit,
+                               seed = self._seed)
+        self._start_recording()
+
+    def _font(self, size: int) -> pygame.font.Font:
+        """Get the font of a size, loading it the first time it is used."""
+        font = self._fonts.get(size)
+        if font is None:
+            if self._font_data is None:
+                pygame.font.init()
+                self._font_data = (importlib.resources.files("snake")
+                                   / FONT_FILE).read_bytes()
+            font = pygame.font.Font(io.BytesIO(self._font_data), size)
+            self._fonts[size] = font
+        return font
+
+    def _start_recording(self) -> None:
+        """Start recording the current game, if asked to."""
+        if self._record_dir is not None:
+            self._record_dir.mkdir(parents = True, exist_ok = True)
+            self._recorder = Recorder(self._sim)
+
+    def _save_recording(self) -> None:
+        """Save the replay of the game that has just ended."""
+        if self._recorder is not None and self._record_dir is not None:
+            replay = self._recorder.replay()
+            now = datetime.datetime.now(datetime.UTC)
+            name = f"{now:%Y%m%d-%H%M%S-%f}-{replay.score}{SUFFIX}"
+            replay.save(self._record_dir / name)
+
+    def _create_renderer(self) -> Renderer:
+        """Create the renderer selected on the command line."""
+        if self._renderer_name == "numpy":
+            try:
+                from .numpy_renderer import NumpyRenderer  # noqa: PLC0415
+            except ImportError as e:
+                feature = "The numpy renderer"
+                raise DependencyError(feature, "numpy") from e
+            return NumpyRenderer(screen = self._screen,
+                                 tile_size = self._tile_size)
+        return Renderer(screen = self._screen, tile_size = self._tile_size)
 
     def _drawgameover(self) -> None:
-        text_gameover = self._fontgameover.render("Game Over", True, pygame.Color("red"))  # noqa: E501, FBT003
+        text_gameover = self._text.render(self._font(GAMEOVER_FONT_SIZE),
+                                          "Game Over", TEXT_COLOR)
         x, y = 80, 160
         self._screen.blit(text_gameover, (x, y))
 
     def _draw_scores(self) -> None:
+        """Draw the score table, composed again only when it changes."""
+        # The name being typed is in the scores too
+        key = (tuple((s.name, s.score) for s in self._scores), self._placed)
+        if self._score_table is None or key != self._score_table_key:
+            self._score_table = self._compose_scores()
+            self._score_table_key = key
+        self._screen.blit(self._score_table, SCORES_POS)
+
+    def _compose_scores(self) -> pygame.Surface:
+        """Compose the score table into a single surface."""
         #mettre une ligne high scores
-        x, y = 80, 10
-        for score in self._scores:
-            text_score = self._fontscore.render(score.name.ljust(Score.MAX_LENGTH)+ f"{score.score:.>8}", True, pygame.Color("red"))
-            self._screen.blit(text_score, (x, y))
-            y += 32
+        font = self._font(SCORE_FONT_SIZE)
+        lines = [(self._text.render(font, score.name.ljust(Score.MAX_LENGTH)
+                                    + f"{score.score:.>8}", TEXT_COLOR),
+                  i * SCORES_LINE_HEIGHT)
+                 for i, score in enumerate(self._scores)]
+
+        # Rank of the last game among all scores
+        if self._placed is not None:
+            rank, total = self._placed
+            lines.append((self._text.render(
+                    font, f"You placed #{rank} of {total}", TEXT_COLOR),
+                          len(lines) * SCORES_LINE_HEIGHT + 16))
+
+        table = pygame.Surface(
+                (max((s.get_width() for s, _ in lines), default = 0),
+                 max((y + s.get_height() for s, y in lines), default = 0)),
+                pygame.SRCALPHA)
+        for surface, y in lines:
+            table.blit(surface, (0, y))
+        return table
+
+    def _draw_profile(self, frame: int) -> pygame.Rect:
+        """Draw the profiler statistics, refreshed twice a second."""
+        if self._overlay is None or frame % max(1, self._render_fps // 2) == 0:
+            font = self._font(OVERLAY_FONT_SIZE)
+            lines = [font.render(line, True, OVERLAY_COLOR, # noqa: FBT003
+                                 OVERLAY_BG_COLOR)
+                     for line in self._profiler.lines()]
+            height = font.get_linesize()
+            self._overlay = pygame.Surface(
+                    (max(line.get_width() for line in lines),
+                     height * len(lines)))
+            self._overlay.fill(OVERLAY_BG_COLOR)
+            for i, line in enumerate(lines):
+                self._overlay.blit(line, (0, i * height))
+
+        # Opaque, so that it hides what was drawn below at previous frames
+        return self._screen.blit(self._overlay, (0, 0))
+
+    def _record_game(self, name: str, score: int) -> None:
+        """Store the result of a game, in the background."""
+        self._score_writer.submit(GameRecord(name = name, score = score,
+                                            width = self._width,
+                                            height = self._height,
+                                            fps = self._fps))
 
     def _process_scores_event(self, event: any) -> None:
         if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
             self._state = State.PLAY
+            self._lag = 0
+            self._turns.clear()
+            if self._worker is not None:
+                self._worker.play()
 
     def _process_inputname(self, event: pygame.event.Event) -> None :
         """The player put his/her name in the ranking list of highscores."""
         if self._new_high_score is not None and event.type == pygame.KEYDOWN :
             if event.key == pygame.K_RETURN:  # Validate the name
                 self._state = State.SCORES
-                self._scores.save(self._score_file)
+                self._record_game(self._new_high_score.name,
+                                  self._new_high_score.score)
             elif event.key == pygame.K_BACKSPACE:  # Correct a mistake
                 self._new_high_score.name=self._new_high_score.name[:-1]
             else :
@@ -135,19 +293,97 @@ class Game:
             # Quit
             match event.key:
                 case pygame.K_UP:
-                    self._snake.dir = Dir.UP
+                    self._queue_turn(Dir.UP)
                 case pygame.K_DOWN:
-                    self._snake.dir = Dir.DOWN
+                    self._queue_turn(Dir.DOWN)
                 case pygame.K_LEFT:
-                    self._snake.dir = Dir.LEFT
+                    self._queue_turn(Dir.LEFT)
                 case pygame.K_RIGHT:
-                    self._snake.dir = Dir.RIGHT
-
-
-    def _process_events(self) -> None:
+                    self._queue_turn(Dir.RIGHT)
+
+
+    def _queue_turn(self, direction: Dir) -> None:
+        """Queue a turn for the next ticks, unless it changes nothing."""
+        if self._worker is not None:
+            self._worker.turn(direction)
+            return
+        last = self._turns[-1] if self._turns else self._sim.snake.dir
+        if direction != last and len(self._turns) < TURN_QUEUE_SIZE:
+            self._turns.append(direction)
+
+    def _step(self, action: Dir | None) -> bool:
+        """Advance the simulation by one tick, recording it."""
+        if self._recorder is not None:
+            self._recorder.turn(action)
+        game_over = self._sim.step(action)
+        if game_over:
+            self._save_recording()
+        return game_over
+
+    def _tick(self) -> None:
+        """Advance the game by one tick, taking the next queued turn."""
+        action = self._turns.popleft() if self._turns else None
+        if self._step(action):
+            self._game_over()
+            self._turns.clear()
+
+    def _game_over(self) -> None:
+        """Show the game over screen for a second."""
+        self._state = State.GAME_OVER
+        self._countdown = self._render_fps
+
+    def _end_game(self) -> None:
+        """Leave the game over screen, placing the score of the game."""
+        score = self._new_game()
+        highscore = self._scores.is_highscore(score)
+        self._new_high_score=Score(name="", score=score)
+        rank = self._scores.add_score(self._new_high_score)
+        self._placed = (rank, len(self._scores))
+        if highscore:
+            self._state= State.INPUT_NAME
+        else :
+            self._record_game("", score)
+            self._state=State.SCORES
+
+    def _new_game(self) -> int:
+        """Start a new game, and get the score of the last one."""
+        with (contextlib.nullcontext() if self._worker is None
+              else self._worker.locked()):
+            score = self._sim.score
+            self._sim.reset()
+            self._start_recording()
+        return score
+
+    def _draw_game(self, *, incremental: bool) -> list[pygame.Rect] | None:
+        """
+        Draw the game, only its dirty cells if incremental.
+
+        Return the screen rectangles redrawn, or None if all the screen has to
+        be displayed again.
+        """
+        if self._worker is not None:
+            rects = self._renderer.draw_snapshot(
+                    self._worker.latest(),
+                    (self._snake_head_color, self._snake_body_color,
+                     self._fruit_color),
+                    full = not incremental)
+            return rects if incremental else None
+        if incremental:
+            return self._renderer.draw_dirty(self._sim.board)
+        self._renderer.draw(self._sim.board)
+        return None
+
+    def _wait_events(self) -> list[pygame.event.Event]:
+        """Wait for events, sleeping until one comes or for IDLE_TIMEOUT."""
+        event = pygame.event.wait(IDLE_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event, *pygame.event.get()]
+
+    def _process_events(self, events: list[pygame.event.Event]) -> None:
         """Process pygame events."""
         # Loop on all events
-        for event in pygame.event.get():
+        for event in events:
 
             match self._state:
                 case State.SCORES:
@@ -168,55 +404,130 @@ class Game:
                         self._state = State.QUIT
 
 
+    def _next_events(self, *, idle: bool) -> tuple[list[pygame.event.Event],
+                                                    int]:
+        """
+        Wait for the next frame, and get its events.
+
+        Return the events, and the time elapsed since the last frame in
+        milliseconds. When idle, sleep until something happens instead, and
+        count no time, so that the time slept is not played.
+        """
+        if not idle:
+            elapsed = self._clock.tick(self._render_fps)
+            return pygame.event.get(), elapsed
+        events = self._wait_events()
+
+        # Restart the clock
+        self._clock.tick()
+        return events, 0
+
+    def _update(self, elapsed: int) -> None:
+        """Play the ticks due after elapsed milliseconds."""
+        if self._state != State.PLAY:
+            return
+
+        # Played by the worker, only check if it is over
+        if self._worker is not None:
+            if self._worker.latest().game_over:
+                self._game_over()
+            return
+
+        self._lag += elapsed
+        ticks = 0
+        while self._lag >= self._tick_time and self._state == State.PLAY:
+            self._tick()
+            self._lag -= self._tick_time
+            ticks += 1
+
+            # Too late, give up catching up
+            if ticks == MAX_TICKS_PER_FRAME:
+                self._lag = 0
+
+    def _draw_state(self) -> None:
+        """Draw what is displayed over the game in the current state."""
+        match self._state :
+            case State.GAME_OVER :
+                self._drawgameover()
+                self._countdown -= 1
+                if self._countdown == 0 :
+                    self._end_game()
+            case State.SCORES | State.INPUT_NAME:
+                self._draw_scores()
+
     def start(self) -> None:
         """Start the game."""
-        # Initialize pygame
-        pygame.init()
-
-
-        # Initialize game
+        # Initialize game, and the pygame modules it needs (the display, then
+        # the fonts when first used)
         self._init()
 
         # Start pygame loop
         self._state = State.SCORES
+        drawn_state: State | None = None
+        profiler = self._profiler
+        profiler.start()
+        frame = 0
         while self._state != State.QUIT:
 
-            # Wait 1/FPS second
-            self._clock.tick(self._fps)
+            # Wait 1/FPS second, or until something happens if the screen is
+            # static
+            idle = self._state in IDLE_STATES and drawn_state == self._state
+            events, elapsed = self._next_events(idle = idle)
+            profiler.start_frame()
 
             # Listen for events
-            self._process_events()
-
-            # Update objects
-            try:
-                if self._state == State.PLAY:
-                    self._snake.move()
-            except GameOver:
-                self._state = State.GAME_OVER
-                cpt = self._fps
-
-            # Draw
-            self._board.draw()
-            match self._state :
-                case State.GAME_OVER :
-                    self._drawgameover()
-                    cpt-=1
-                    if cpt==0 :
-                        score=len(self._snake._tiles)
-                        self._reset_snake()
-                        if self._scores.is_highscore(score):
-                            self._new_high_score=Score(name="", score=score)
-                            self._scores.add_score(self._new_high_score)
-                            self._state= State.INPUT_NAME
-                        else :
-                            self._state=State.SCORES
-                case State.SCORES | State.INPUT_NAME:
-                    self._draw_scores()
-
+            self._process_events(events)
+            profiler.lap("events")
+
+            # Nothing to draw again
+            if idle and self._state == drawn_state and not any(
+                    e.type in REDRAW_EVENTS for e in events):
+                continue
+
+            # Update objects, at the game's pace whatever the frame rate
+            self._update(elapsed)
+            profiler.lap("move")
+
+            # Draw only the dirty cells while playing, and everything on
+            # state changes or when an overlay is displayed
+            rects = self._draw_game(incremental = self._state == State.PLAY
+                                    and drawn_state == State.PLAY)
+            drawn_state = self._state
+            profiler.lap("draw")
+            self._draw_state()
+            profiler.lap("text")
+
+            # Profiler statistics
+            if self._profile_overlay:
+                rect = self._draw_profile(frame)
+                if rects is not None:
+                    rects.append(rect)
+            frame += 1
+            profiler.lap("overlay")
 
             # Display
-            pygame.display.update()
-
-    # Terminate pygame
-    pygame.quit()
+            if rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+            profiler.lap("display")
+            profiler.end_frame()
+
+        # Stop the simulation
+        if self._worker is not None:
+            self._worker.close()
+
+        # Store pending scores
+        try:
+            self._score_writer.close()
+        finally:
+            self._score_store.close()
+
+        # Profiling results
+        profiler.stop()
+        if profiler.enabled:
+            print(profiler.summary()) # noqa: T201
+
+        # Terminate pygame
+        pygame.quit()
 
@@ -20,7 +20,12 @@ class GameObject(Subject, Observer, abc.ABC):
     @property
     @abc.abstractmethod
     def tiles(self) -> typing.Iterator[Tile]:
-        """The tiles of the object."""
+        """
+        The tiles of the object.
+
+        For a moving object, the first tile is the leading one (e.g.: the
+        snake's head).
+        """
         raise NotImplementedError
 
     def __contains__(self, other: object) -> bool:
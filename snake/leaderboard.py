@@ -0,0 +1,167 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import bisect
+import itertools
+import typing
+
+# First party
+from .score import Score
+
+# Entries are sorted on (-score, insertion number): best scores first, and
+# older entries first among equal scores.
+_Entry = tuple[int, int, Score]
+
+class Leaderboard:
+    """
+    Sorted collection of scores, for large numbers of entries.
+
+    Entries are kept in a list of sorted buckets, with the last key of each
+    bucket to find the right one by bisection, and a Fenwick tree over the
+    bucket sizes to count the entries before a bucket. Insertion, rank
+    queries and top-K queries take O(log n) (plus a bounded move of memory
+    inside a bucket). A bucket is split when it grows too large.
+    """
+
+    LOAD = 1000 # Target bucket size
+
+    def __init__(self, scores: typing.Iterable[Score] = ()) -> None:
+        """Object initialization."""
+        self._counter = itertools.count()
+        entries = sorted((-s.score, next(self._counter), s) for s in scores)
+        self._buckets = [entries[i:i + self.LOAD]
+                         for i in range(0, len(entries), self.LOAD)]
+        self._len = len(entries)
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Rebuild the last keys of buckets and the Fenwick tree."""
+        self._maxes = [b[-1][:2] for b in self._buckets]
+        self._tree = [len(b) for b in self._buckets]
+        for i in range(len(self._tree)):
+            j = i | (i + 1)
+            if j < len(self._tree):
+                self._tree[j] += self._tree[i]
+
+    def _prefix(self, i: int) -> int:
+        """Count the entries in the buckets before bucket i."""
+        total = 0
+        while i > 0:
+            total += self._tree[i - 1]
+            i &= i - 1
+        return total
+
+    def _increment(self, i: int) -> None:
+        """Count one more entry in bucket i."""
+        while i < len(self._tree):
+            self._tree[i] += 1
+            i |= i + 1
+
+    def __len__(self) -> int:
+        """Count the entries."""
+        return self._len
+
+    def __iter__(self) -> typing.Iterator[Score]:
+        """Iterate on the scores, best first."""
+        for bucket in self._buckets:
+            for entry in bucket:
+                yield entry[2]
+
+    def add(self, score: Score) -> int:
+        """Add a score, and return its rank (starting at 1)."""
+        entry = (-score.score, next(self._counter), score)
+        self._len += 1
+
+        # First entry
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._build_index()
+            return 1
+
+        # Insert in the right bucket
+        i = min(bisect.bisect_left(self._maxes, entry[:2]),
+                len(self._buckets) - 1)
+        bucket = self._buckets[i]
+        pos = bisect.bisect_left(bucket, entry)
+        bucket.insert(pos, entry)
+        rank = self._prefix(i) + pos + 1
+
+        # Split the bucket if it has grown too large
+        if len(bucket) > 2 * self.LOAD:
+            self._buckets[i:i + 1] = [bucket[:self.LOAD],
+                                      bucket[self.LOAD:]]
+            self._build_index()
+        else:
+            self._maxes[i] = bucket[-1][:2]
+            self._increment(i)
+
+        return rank
+
+    def rank(self, score: int) -> int:
+        """Rank that a new score would get, i.e. 1 + number of better ones."""
+        key = (-score, -1)
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return self._len + 1
+        return self._prefix(i) + bisect.bisect_left(self._buckets[i], key) + 1
+
+    def top(self, k: int) -> list[Score]:
+        """Get the k best scores."""
+        return list(itertools.islice(self, k))
+
+class ScoreCounts:
+    """
+    Number of scores of each value, to rank scores among many of them.
+
+    Only the counts are kept, not the scores. Distinct values are sorted, best
+    first, with a Fenwick tree over their counts, so rank queries and
+    additions take O(log d) for d distinct values. A new value rebuilds the
+    tree in O(d), which is rare since scores take few distinct values.
+    """
+
+    def __init__(self, counts: typing.Iterable[tuple[int, int]] = ()) -> None:
+        """Object initialization, from (score, count) pairs."""
+        self._counts: dict[int, int] = {}
+        for score, count in counts:
+            self._counts[score] = self._counts.get(score, 0) + count
+        self._len = sum(self._counts.values())
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Rebuild the sorted keys (opposite values) and the Fenwick tree."""
+        self._keys = sorted(-score for score in self._counts)
+        self._tree = [self._counts[-key] for key in self._keys]
+        for i in range(len(self._tree)):
+            j = i | (i + 1)
+            if j < len(self._tree):
+                self._tree[j] += self._tree[i]
+
+    def _prefix(self, i: int) -> int:
+        """Count the scores of the i best values."""
+        total = 0
+        while i > 0:
+            total += self._tree[i - 1]
+            i &= i - 1
+        return total
+
+    def __len__(self) -> int:
+        """Count the scores."""
+        return self._len
+
+    def rank(self, score: int) -> int:
+        """Rank that a new score would get, i.e. 1 + number of better ones."""
+        return self._prefix(bisect.bisect_left(self._keys, -score)) + 1
+
+    def add(self, score: int) -> int:
+        """Add a score, and return its rank (after the equal ones)."""
+        self._counts[score] = self._counts.get(score, 0) + 1
+        self._len += 1
+        i = bisect.bisect_left(self._keys, -score)
+        if i == len(self._keys) or self._keys[i] != -score:
+            self._build_index()
+        else:
+            j = i
+            while j < len(self._tree):
+                self._tree[j] += 1
+                j |= j + 1
+        return self._prefix(i + 1)
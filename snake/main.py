@@ -1,29 +1,51 @@
 # ruff: noqa: D100,S311
 
 # Standard
+import importlib
 import sys
 from pathlib import Path
 
 # First party
 from .cmd_line import read_args
 from .exceptions import SnakeError
-from .game import Game
 
+# Sub-commands, run instead of the game when given as first argument, with the
+# module of their main function (imported only when run)
+COMMANDS = {"tournament": "tournament", "replay": "replay",
+            "bench": "benchmark"}
 
 def main() -> None: # noqa: D103
 
     try:
+        # Run a sub-command
+        if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+            module = importlib.import_module(f".{COMMANDS[sys.argv[1]]}",
+                                             __package__)
+            module.main(sys.argv[2:])
+            return
+
         # Read command line arguments
         args = read_args()
 
-        # Start game
+        # Start game, importing pygame only now
+        from .game import Game # noqa: PLC0415
         Game(width = args.width, height = args.height,
              tile_size = args.tile_size, fps = args.fps,
+             render_fps = args.render_fps,
              fruit_color = args.fruit_color,
              snake_head_color = args.snake_head_color,
              snake_body_color = args.snake_body_color,
              gameover_on_exit = args.gameover_on_exit,
              score_file = Path(args.scores_file),
+             scores_backend = args.scores_backend,
+             renderer = args.renderer,
+             seed = args.seed,
+             record_dir = None if args.record is None else Path(args.record),
+             profile = args.profile,
+             profile_overlay = args.profile_overlay,
+             profile_stats = None if args.profile_stats is None
+                             else Path(args.profile_stats),
+             sim_thread = args.sim_thread,
              ).start()
 
     except SnakeError as e:
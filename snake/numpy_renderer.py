@@ -0,0 +1,168 @@
+# ruff: noqa: D100,S311
+
+# Third party
+import numpy as np
+import pygame
+
+# First party
+from .board import Board
+from .checkerboard import CB_COLOR_1, CB_COLOR_2
+from .color import Color
+from .renderer import Renderer
+from .snapshot import Snapshot
+
+# Constants
+MAX_COLORS = 256
+
+class NumpyRenderer(Renderer):
+    """
+    Draws a board using NumPy arrays.
+
+    The board is kept as a grid of palette indices, one per cell: the two
+    background colors, then one index per object color (snake's head and
+    body, fruit). A frame is produced by mapping the grid through the palette,
+    blitting the result on a one pixel per cell surface, and scaling it up by
+    the tile size in a single call. The grid itself is updated from the dirty
+    cells of the board, or from the cells that differ between two snapshots,
+    so the cost of a frame barely depends on the snake's length.
+    """
+
+    def __init__(self, screen: pygame.Surface, tile_size: int,
+                 bg_colors: tuple[Color, Color] = (CB_COLOR_1, CB_COLOR_2),
+                 ) -> None:
+        """Object initialization."""
+        super().__init__(screen, tile_size, bg_colors)
+        self._palette = np.zeros((MAX_COLORS, 3), dtype = np.uint8)
+        self._color_indices: dict[tuple[int, int, int], int] = {}
+        self._background_grid: np.ndarray | None = None
+        self._grid_key_value: tuple[object, ...] | None = None
+        self._grid: np.ndarray | None = None
+        self._small: pygame.Surface | None = None
+
+    def _color_index(self, color: Color) -> int:
+        """Get the palette index of a color, adding it if needed."""
+        c = pygame.Color(color)
+        rgb = (c.r, c.g, c.b)
+        index = self._color_indices.get(rgb)
+        if index is None:
+            index = len(self._color_indices)
+            if index >= MAX_COLORS:
+                msg = f"Too many colors, at most {MAX_COLORS} are allowed."
+                raise ValueError(msg)
+            self._color_indices[rgb] = index
+            self._palette[index] = rgb
+        return index
+
+    def _grid_key(self, nb_lines: int, nb_cols: int) -> tuple[object, ...]:
+        """Get the parameters the background grid depends on."""
+        return (nb_lines, nb_cols, self._bg_colors)
+
+    def _reset_grid(self, nb_lines: int, nb_cols: int) -> np.ndarray:
+        """Reset the grid to the background, rebuilding it if needed."""
+        key = self._grid_key(nb_lines, nb_cols)
+        if self._background_grid is None or key != self._grid_key_value:
+            self._color_indices.clear()
+            bg = [self._color_index(c) for c in self._bg_colors]
+            x, y = np.indices((nb_cols, nb_lines))
+            self._background_grid = np.where((x + y) % 2 == 0, bg[0],
+                                             bg[1]).astype(np.uint8)
+            self._grid = self._background_grid.copy()
+            self._small = pygame.Surface((nb_cols, nb_lines))
+            self._grid_key_value = key
+        else:
+            assert self._grid is not None # noqa: S101
+            self._grid[...] = self._background_grid
+        return self._grid
+
+    def _blit(self) -> None:
+        """Produce the frame from the grid, and scale it on screen."""
+        assert self._grid is not None # noqa: S101
+        assert self._small is not None # noqa: S101
+        pygame.surfarray.blit_array(self._small, self._palette[self._grid])
+        size = (self._small.get_width() * self._tile_size,
+                self._small.get_height() * self._tile_size)
+        if self._screen.get_size() == size:
+            pygame.transform.scale(self._small, size, self._screen)
+        else:
+            self._screen.blit(pygame.transform.scale(self._small, size),
+                              (0, 0))
+
+    def draw(self, board: Board) -> None:
+        """Draw the background and all objects of the board on screen."""
+        # Changes are all included in a full redraw
+        board.pop_dirty()
+        self._drawn_snapshot = None
+
+        # Rebuild the whole grid
+        grid = self._reset_grid(board.nb_lines, board.nb_cols)
+        for obj in board.objects:
+            for tile in obj.tiles:
+                if 0 <= tile.x < board.nb_cols and 0 <= tile.y < board.nb_lines:
+                    grid[tile.x, tile.y] = self._color_index(tile.color)
+
+        self._blit()
+
+    def draw_dirty(self, board: Board) -> list[pygame.Rect]:
+        """
+        Update the grid with the cells that changed, and draw the frame.
+
+        Return the list of screen rectangles that have changed.
+        """
+        if (self._grid is None or self._background_grid is None or
+                self._grid_key(board.nb_lines, board.nb_cols)
+                != self._grid_key_value):
+            self.draw(board)
+            return [self._screen.get_rect()]
+
+        size = self._tile_size
+        rects = []
+        self._drawn_snapshot = None
+
+        # Loop on all dirty cells
+        for (x, y), tile in board.pop_dirty().items():
+            self._grid[x, y] = (self._background_grid[x, y] if tile is None
+                                else self._color_index(tile.color))
+            rects.append(pygame.Rect(x * size, y * size, size, size))
+
+        self._blit()
+
+        return rects
+
+    def draw_snapshot(self, snapshot: Snapshot,
+                      colors: tuple[Color, Color, Color], *,
+                      full: bool = False) -> list[pygame.Rect]:
+        """
+        Update the grid from a snapshot of a game, and draw the frame.
+
+        Only the cells that changed since the last snapshot drawn are updated,
+        unless a full redraw is asked for. Return the list of screen
+        rectangles that have changed.
+        """
+        full = (full or self._drawn_snapshot is None
+                or self._grid_key(snapshot.nb_lines, snapshot.nb_cols)
+                != self._grid_key_value)
+        if snapshot is self._drawn_snapshot and not full:
+            return []
+
+        if full:
+            grid = self._reset_grid(snapshot.nb_lines, snapshot.nb_cols)
+        else:
+            assert self._grid is not None # noqa: S101
+            grid = self._grid
+        assert self._background_grid is not None # noqa: S101
+        cells, changed = self._snapshot_changes(snapshot, colors, full = full)
+        size = self._tile_size
+        rects = [self._screen.get_rect()] if full else []
+
+        # Loop on changed cells
+        for cell in changed:
+            y, x = divmod(cell, snapshot.nb_cols)
+            color = cells.get(cell)
+            grid[x, y] = (self._background_grid[x, y] if color is None
+                          else self._color_index(color))
+            if not full:
+                rects.append(pygame.Rect(x * size, y * size, size, size))
+
+        self._blit()
+
+        return rects
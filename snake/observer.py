@@ -5,6 +5,7 @@ import typing
 
 if typing.TYPE_CHECKING:
     from .game_object import GameObject
+    from .tile import Tile
 
 class Observer:
     """Interface representing an observer for the Observer pattern."""
@@ -16,6 +17,9 @@ class Observer:
     def notify_object_moved(self, obj: "GameObject") -> None:
         """Notify that an object has moved."""
 
+    def notify_tile_freed(self, obj: "GameObject", tile: "Tile") -> None:
+        """Notify that an object does not cover a tile anymore."""
+
     def notify_collision(self, obj: "GameObject") -> None:
         """Notify that an object collides with another."""
 
@@ -0,0 +1,160 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+import cProfile
+import time
+from pathlib import Path
+
+# Phases of a frame, in the order of the game loop
+PHASES = ("events", "move", "draw", "text", "overlay", "display")
+FRAME = "frame" # Whole frame, without waiting for the clock
+PERCENTILES = (50, 95, 99)
+
+# Constants
+DEF_WINDOW = 600 # Number of frames kept for statistics
+
+class PhaseTimes:
+    """Durations of a phase over the last frames, with percentiles."""
+
+    def __init__(self, window: int = DEF_WINDOW) -> None:
+        """Object initialization."""
+        self._times: collections.deque[float] = collections.deque(
+                maxlen = window)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add the duration of the phase in one frame, in seconds."""
+        self._times.append(duration)
+        self._count += 1
+        self._total += duration
+        self._max = max(self._max, duration)
+
+    @property
+    def count(self) -> int:
+        """Number of durations added since the start."""
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        """Mean duration since the start."""
+        return self._total / self._count if self._count else 0.0
+
+    @property
+    def max(self) -> float:
+        """Longest duration since the start."""
+        return self._max
+
+    def percentiles(self) -> tuple[float, ...]:
+        """Get the percentiles of the durations of the last frames."""
+        if not self._times:
+            return tuple(0.0 for _ in PERCENTILES)
+        times = sorted(self._times)
+        return tuple(times[min(len(times) - 1, len(times) * p // 100)]
+                     for p in PERCENTILES)
+
+    def window_max(self) -> float:
+        """Longest duration of the last frames."""
+        return max(self._times, default = 0.0)
+
+class FrameProfiler:
+    """
+    Times each phase of the frames of the game loop.
+
+    Call `start_frame` after waiting for the clock, then `lap` at the end of
+    each phase, which times the phase since the previous lap, and `end_frame`.
+    A disabled profiler does nothing, at the cost of a method call.
+
+    Optionally, the whole run is profiled with cProfile too, and its
+    statistics dumped to a file when stopped.
+    """
+
+    def __init__(self, budget: float, *, enabled: bool = True,
+                 stats_file: Path | None = None,
+                 window: int = DEF_WINDOW) -> None:
+        """Object initialization."""
+        self._budget = budget
+        self._enabled = enabled
+        self._stats_file = stats_file
+        self._window = window
+        # Running cProfile, with the file where to dump its statistics
+        self._cprofile: tuple[cProfile.Profile, Path] | None = None
+        self._phases = {p: PhaseTimes(window) for p in (*PHASES, FRAME)}
+        self._over_budget = 0
+        self._frame_start = 0.0
+        self._lap_start = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        """Tell if the profiler times the frames."""
+        return self._enabled
+
+    @property
+    def over_budget(self) -> int:
+        """Number of frames longer than the frame budget."""
+        return self._over_budget
+
+    def __getitem__(self, phase: str) -> PhaseTimes:
+        """Get the durations of a phase."""
+        return self._phases[phase]
+
+    def start(self) -> None:
+        """Start profiling the run with cProfile, if asked to."""
+        if self._stats_file is not None:
+            profile = cProfile.Profile()
+            self._cprofile = (profile, self._stats_file)
+            profile.enable()
+
+    def stop(self) -> None:
+        """Stop cProfile, and dump its statistics."""
+        if self._cprofile is not None:
+            profile, stats_file = self._cprofile
+            profile.disable()
+            profile.dump_stats(stats_file)
+            self._cprofile = None
+
+    def start_frame(self) -> None:
+        """Start timing a frame."""
+        if self._enabled:
+            self._frame_start = self._lap_start = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """Time a phase, which has lasted since the previous lap."""
+        if self._enabled:
+            now = time.perf_counter()
+            self._phases[phase].add(now - self._lap_start)
+            self._lap_start = now
+
+    def end_frame(self) -> None:
+        """Stop timing the frame."""
+        if self._enabled:
+            duration = self._lap_start - self._frame_start
+            self._phases[FRAME].add(duration)
+            if duration > self._budget:
+                self._over_budget += 1
+
+    def lines(self) -> list[str]:
+        """Short statistics of the last frames, one line per phase (in ms)."""
+        lines = [f"{'phase':<8}" + "".join(f"{'p' + str(p):>7}"
+                                           for p in PERCENTILES)
+                 + f"{'max':>7}"]
+        for name, times in self._phases.items():
+            values = (*times.percentiles(), times.window_max())
+            lines.append(f"{name:<8}" + "".join(f"{v * 1000:7.2f}"
+                                                for v in values))
+        return lines
+
+    def summary(self) -> str:
+        """Summary of the whole run."""
+        frames = self._phases[FRAME].count
+        lines = [f"{frames} frames profiled, {self._over_budget} over the"
+                 f" {self._budget * 1000:.1f} ms budget.",
+                 f"Last {min(frames, self._window)} frames, in ms:",
+                 *self.lines(), "Whole run, in ms:",
+                 f"{'phase':<8}{'mean':>7}{'max':>7}"]
+        lines.extend(f"{name:<8}{times.mean * 1000:7.2f}"
+                     f"{times.max * 1000:7.2f}"
+                     for name, times in self._phases.items())
+        return "\n".join(lines)
@@ -0,0 +1,187 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import typing
+
+# Third party
+import pygame
+
+# First party
+from .board import Board
+from .checkerboard import CB_COLOR_1, CB_COLOR_2, Checkerboard
+from .color import Color
+from .snapshot import Snapshot
+from .tile import Tile
+
+
+class Renderer:
+    """
+    Draws a board and its objects on a pygame surface.
+
+    The checkerboard background never changes during a game, so it is
+    rendered once into an off-screen surface and blitted in one call. The
+    surface is rebuilt only when the board size, the tile size or the
+    background colors change.
+
+    During normal play only a few cells change each frame (the snake's head
+    and tail, the fruit), so the renderer can also redraw just the dirty cells
+    reported by the board and return their rectangles for a partial display
+    update.
+
+    Snapshots of a game can be drawn too, the same way: only the cells that
+    differ from the last snapshot drawn are drawn again.
+    """
+
+    def __init__(self, screen: pygame.Surface, tile_size: int,
+                 bg_colors: tuple[Color, Color] = (CB_COLOR_1, CB_COLOR_2),
+                 ) -> None:
+        """Object initialization."""
+        self._screen = screen
+        self._tile_size = tile_size
+        self._bg_colors = bg_colors
+        self._background: pygame.Surface | None = None
+        self._background_key: tuple[object, ...] | None = None
+        self._drawn_snapshot: Snapshot | None = None
+        self._drawn_cells: dict[int, Color] = {}
+
+    @property
+    def tile_size(self) -> int:
+        """Tile size, in pixels."""
+        return self._tile_size
+
+    @tile_size.setter
+    def tile_size(self, tile_size: int) -> None:
+        self._tile_size = tile_size
+
+    @property
+    def bg_colors(self) -> tuple[Color, Color]:
+        """The two colors of the checkerboard background."""
+        return self._bg_colors
+
+    @bg_colors.setter
+    def bg_colors(self, colors: tuple[Color, Color]) -> None:
+        self._bg_colors = colors
+
+    def _draw_tile(self, surface: pygame.Surface, tile: Tile) -> None:
+        """Draw a tile on a surface."""
+        size = self._tile_size
+        rect = pygame.Rect(tile.x * size, tile.y * size, size, size)
+        pygame.draw.rect(surface, tile.color, rect)
+
+    def _get_background(self, nb_lines: int, nb_cols: int) -> pygame.Surface:
+        """Get the background surface, rendering it if needed."""
+        key = (nb_lines, nb_cols, self._tile_size, self._bg_colors)
+        if self._background is None or key != self._background_key:
+            self._background = pygame.Surface((nb_cols * self._tile_size,
+                                               nb_lines * self._tile_size))
+            checkerboard = Checkerboard(nb_lines = nb_lines,
+                                        nb_cols = nb_cols,
+                                        colors = self._bg_colors)
+            for tile in checkerboard.tiles:
+                self._draw_tile(self._background, tile)
+            self._background_key = key
+        return self._background
+
+    def draw(self, board: Board) -> None:
+        """Draw the background and all objects of the board on screen."""
+        # Changes are all included in a full redraw
+        board.pop_dirty()
+        self._drawn_snapshot = None
+
+        # Background
+        background = self._get_background(board.nb_lines, board.nb_cols)
+        self._screen.blit(background, (0, 0))
+
+        # Loop on all objects
+        for obj in board.objects:
+
+            # Loop on all object's tiles
+            for tile in obj.tiles:
+                self._draw_tile(self._screen, tile)
+
+    def draw_dirty(self, board: Board) -> list[pygame.Rect]:
+        """
+        Redraw only the cells that changed on the board.
+
+        Return the list of screen rectangles that have been redrawn.
+        """
+        background = self._get_background(board.nb_lines, board.nb_cols)
+        size = self._tile_size
+        rects = []
+        self._drawn_snapshot = None
+
+        # Loop on all dirty cells
+        for (x, y), tile in board.pop_dirty().items():
+            rect = pygame.Rect(x * size, y * size, size, size)
+            self._screen.blit(background, rect, rect)
+            if tile is not None:
+                self._draw_tile(self._screen, tile)
+            rects.append(rect)
+
+        return rects
+
+    @staticmethod
+    def _snapshot_cells(snapshot: Snapshot, colors: tuple[Color, Color, Color],
+                        ) -> dict[int, Color]:
+        """Get the color of each occupied cell of a snapshot."""
+        head_color, body_color, fruit_color = colors
+        cells = dict.fromkeys(snapshot.body, body_color)
+        if snapshot.body:
+            cells[snapshot.body[0]] = head_color
+        if snapshot.fruit is not None:
+            cells[snapshot.fruit] = fruit_color
+        return cells
+
+    def _snapshot_changes(self, snapshot: Snapshot,
+                          colors: tuple[Color, Color, Color], *, full: bool,
+                          ) -> tuple[dict[int, Color], typing.Iterable[int]]:
+        """
+        Get the colors of the cells of a snapshot, and the cells to draw.
+
+        The cells to draw are all occupied cells, or only the ones that changed
+        since the last snapshot drawn.
+        """
+        cells = self._snapshot_cells(snapshot, colors)
+        changed: typing.Iterable[int] = cells
+        if not full:
+            drawn = self._drawn_cells
+            changed = [c for c in drawn.keys() | cells.keys()
+                       if drawn.get(c) != cells.get(c)]
+        self._drawn_snapshot = snapshot
+        self._drawn_cells = cells
+        return cells, changed
+
+    def draw_snapshot(self, snapshot: Snapshot,
+                      colors: tuple[Color, Color, Color], *,
+                      full: bool = False) -> list[pygame.Rect]:
+        """
+        Draw a snapshot of a game, given the head, body and fruit colors.
+
+        Only the cells that changed since the last snapshot drawn are drawn
+        again, unless a full redraw is asked for. Return the list of screen
+        rectangles that have been redrawn.
+        """
+        previous = self._drawn_snapshot
+        full = full or previous is None or (
+                (previous.nb_lines, previous.nb_cols)
+                != (snapshot.nb_lines, snapshot.nb_cols))
+        if snapshot is previous and not full:
+            return []
+
+        background = self._get_background(snapshot.nb_lines, snapshot.nb_cols)
+        cells, changed = self._snapshot_changes(snapshot, colors, full = full)
+        size = self._tile_size
+        rects = [self._screen.blit(background, (0, 0))] if full else []
+
+        # Loop on changed cells
+        for cell in changed:
+            y, x = divmod(cell, snapshot.nb_cols)
+            rect = pygame.Rect(x * size, y * size, size, size)
+            if not full:
+                self._screen.blit(background, rect, rect)
+                rects.append(rect)
+            color = cells.get(cell)
+            if color is not None:
+                pygame.draw.rect(self._screen, color, rect)
+
+        return rects
@@ -0,0 +1,420 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import bisect
+import dataclasses
+import io
+import struct
+import time
+import typing
+import zlib
+from pathlib import Path
+
+# First party
+from .cmd_line import read_replay_args
+from .dir import Dir
+from .exceptions import ReplayError
+from .simulation import Simulation
+from .snapshot import Snapshot
+from .topology import Topology
+
+# Binary format
+MAGIC = b"SNKR"
+VERSION = 2 # Version 1 has no keyframes
+DIRS = tuple(Dir) # Direction of a turn, stored as its index in this tuple
+END = 0xFF # Marks the end of the turns
+MT_STATE = struct.Struct("<625I") # Mersenne Twister state: 624 words + index
+DOUBLE = struct.Struct("<d")
+
+# Number of ticks between two keyframes
+DEF_KEYFRAME_INTERVAL = 1000
+
+# Replay files suffix
+SUFFIX = ".snkr"
+
+def write_varint(out: typing.BinaryIO, value: int) -> None:
+    """Write an unsigned integer in LEB128 encoding (7 bits per byte)."""
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.write(bytes((byte | 0x80,)))
+        else:
+            out.write(bytes((byte,)))
+            return
+
+def read_varint(inp: typing.BinaryIO) -> int:
+    """Read an unsigned integer in LEB128 encoding."""
+    value = 0
+    shift = 0
+    while True:
+        byte = read_byte(inp)
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value
+        shift += 7
+
+def read_byte(inp: typing.BinaryIO) -> int:
+    """Read one byte."""
+    data = inp.read(1)
+    if not data:
+        msg = "Unexpected end of replay data."
+        raise ReplayError(msg)
+    return data[0]
+
+def zigzag(value: int) -> int:
+    """Map a signed integer to an unsigned one (0, -1, 1, -2... to 0, 1...)."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value: int) -> int:
+    """Revert zigzag."""
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+@dataclasses.dataclass(frozen = True)
+class Keyframe:
+    """
+    A compressed snapshot of a game at a given tick.
+
+    The snapshot's snake direction and length, fruit, body and random number
+    generator state are stored. The body is stored as the head's cell followed
+    by, for each next tile, the direction leading to it, and the whole is
+    compressed with zlib. It is only decoded when restored.
+    """
+
+    tick: int
+    data: bytes
+
+    @classmethod
+    def capture(cls, sim: Simulation) -> typing.Self:
+        """Capture the state of a simulation."""
+        return cls.encode(sim.snapshot())
+
+    @classmethod
+    def encode(cls, snapshot: Snapshot) -> typing.Self:
+        """Compress a snapshot of a game that is not over."""
+        topology = Topology.get(snapshot.nb_lines, snapshot.nb_cols,
+                                wrap = True)
+        out = io.BytesIO()
+        out.write(bytes((DIRS.index(snapshot.direction),)))
+        write_varint(out, snapshot.length)
+        write_varint(out, 0 if snapshot.fruit is None else snapshot.fruit + 1)
+
+        # Body
+        cell = snapshot.body[0]
+        write_varint(out, cell)
+        for following in snapshot.body[1:]:
+            out.write(bytes((next(i for i, d in enumerate(DIRS)
+                                  if topology.next_cell(cell, d) == following),
+                             )))
+            cell = following
+
+        # Random number generator
+        (_, mt_state, gauss), batch, initial_seed = snapshot.rng_state
+        write_varint(out, zigzag(initial_seed))
+        out.write(MT_STATE.pack(*mt_state))
+        out.write(bytes((gauss is not None,)))
+        if gauss is not None:
+            out.write(DOUBLE.pack(gauss))
+        write_varint(out, len(batch))
+        out.write(struct.pack(f"<{len(batch)}d", *batch))
+
+        return cls(tick = snapshot.ticks,
+                   data = zlib.compress(out.getvalue(), 9))
+
+    def decode(self, nb_lines: int, nb_cols: int) -> Snapshot:
+        """Decompress the snapshot, for a board of the given size."""
+        try:
+            return self._decode(nb_lines, nb_cols)
+        except (zlib.error, struct.error) as e:
+            msg = f"Corrupted keyframe at tick {self.tick}."
+            raise ReplayError(msg) from e
+
+    def _decode(self, nb_lines: int, nb_cols: int) -> Snapshot:
+        """Decompress the snapshot, letting decoding errors through."""
+        topology = Topology.get(nb_lines, nb_cols, wrap = True)
+        inp = io.BytesIO(zlib.decompress(self.data))
+        direction = DIRS[read_byte(inp) % len(DIRS)]
+        length = read_varint(inp)
+        fruit = read_varint(inp)
+
+        # Body
+        body = [read_varint(inp)]
+        for _ in range(length - 1):
+            body.append(topology.next_cell(body[-1],
+                                           DIRS[read_byte(inp) % len(DIRS)]))
+
+        # Random number generator
+        initial_seed = unzigzag(read_varint(inp))
+        mt_state = MT_STATE.unpack(inp.read(MT_STATE.size))
+        gauss = DOUBLE.unpack(inp.read(DOUBLE.size))[0] if read_byte(inp) \
+                else None
+        nb = read_varint(inp)
+        batch = struct.unpack(f"<{nb}d", inp.read(nb * DOUBLE.size))
+
+        return Snapshot(nb_lines = nb_lines, nb_cols = nb_cols,
+                        body = tuple(body), direction = direction,
+                        fruit = None if fruit == 0 else fruit - 1,
+                        ticks = self.tick, game_over = False, cause = None,
+                        rng_state = ((3, mt_state, gauss), batch,
+                                     initial_seed))
+
+    def restore(self, sim: Simulation) -> None:
+        """Put a simulation in the captured state."""
+        sim.restore(self.decode(sim.nb_lines, sim.nb_cols))
+
+@dataclasses.dataclass(frozen = True)
+class Replay:
+    """
+    The recording of a game: its settings, its seed and the player's turns.
+
+    Stored as: magic, version, then as varints the zigzagged seed, the board
+    size, the start length and the gameover_on_exit flag, then each turn as a
+    varint tick delta since the previous turn followed by one direction byte.
+    An END byte, preceded by the delta to the last tick, closes the turns,
+    followed by the final score.
+
+    Then come the keyframes, so that any tick can be reached without playing
+    the game from its start: their number, an index giving for each one its
+    tick (as a delta) and its size, and the keyframes data.
+    """
+
+    seed: int
+    nb_lines: int
+    nb_cols: int
+    snake_length: int
+    gameover_on_exit: bool
+    turns: tuple[tuple[int, Dir], ...] # (tick, new direction)
+    ticks: int
+    score: int
+    keyframes: tuple[Keyframe, ...] = ()
+
+    def to_bytes(self) -> bytes:
+        """Encode the replay."""
+        out = io.BytesIO()
+        out.write(MAGIC)
+        out.write(bytes((VERSION,)))
+        for value in (zigzag(self.seed), self.nb_lines, self.nb_cols,
+                      self.snake_length, int(self.gameover_on_exit)):
+            write_varint(out, value)
+        last = 0
+        for tick, direction in self.turns:
+            write_varint(out, tick - last)
+            out.write(bytes((DIRS.index(direction),)))
+            last = tick
+        write_varint(out, self.ticks - last)
+        out.write(bytes((END,)))
+        write_varint(out, self.score)
+
+        # Keyframes index, then data
+        write_varint(out, len(self.keyframes))
+        last = 0
+        for keyframe in self.keyframes:
+            write_varint(out, keyframe.tick - last)
+            write_varint(out, len(keyframe.data))
+            last = keyframe.tick
+        for keyframe in self.keyframes:
+            out.write(keyframe.data)
+        return out.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> typing.Self:
+        """Decode a replay."""
+        inp = io.BytesIO(data)
+        if inp.read(len(MAGIC)) != MAGIC:
+            msg = "Not a replay file."
+            raise ReplayError(msg)
+        version = read_byte(inp)
+        if not 1 <= version <= VERSION:
+            msg = f"Unsupported replay version {version}."
+            raise ReplayError(msg)
+        seed = unzigzag(read_varint(inp))
+        nb_lines, nb_cols, snake_length, gameover_on_exit = (
+                read_varint(inp) for _ in range(4))
+        turns = []
+        tick = 0
+        while True:
+            tick += read_varint(inp)
+            code = read_byte(inp)
+            if code == END:
+                break
+            if code >= len(DIRS):
+                msg = f"Wrong direction code {code}."
+                raise ReplayError(msg)
+            turns.append((tick, DIRS[code]))
+        score = read_varint(inp)
+
+        # Keyframes
+        keyframes = []
+        if version >= 2: # noqa: PLR2004
+            index = []
+            last = 0
+            for _ in range(read_varint(inp)):
+                last += read_varint(inp)
+                index.append((last, read_varint(inp)))
+            for kf_tick, size in index:
+                data = inp.read(size)
+                if len(data) != size:
+                    msg = "Unexpected end of replay data."
+                    raise ReplayError(msg)
+                keyframes.append(Keyframe(tick = kf_tick, data = data))
+
+        return cls(seed = seed, nb_lines = nb_lines, nb_cols = nb_cols,
+                   snake_length = snake_length,
+                   gameover_on_exit = bool(gameover_on_exit),
+                   turns = tuple(turns), ticks = tick, score = score,
+                   keyframes = tuple(keyframes))
+
+    def save(self, path: Path) -> None:
+        """Save the replay to a file."""
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> typing.Self:
+        """Load a replay from a file."""
+        return cls.from_bytes(path.read_bytes())
+
+    def simulation(self, **kwargs: typing.Any) -> Simulation: # noqa: ANN401
+        """Create the simulation at the start of the game."""
+        return Simulation(nb_lines = self.nb_lines, nb_cols = self.nb_cols,
+                          snake_length = self.snake_length,
+                          gameover_on_exit = self.gameover_on_exit,
+                          seed = self.seed, **kwargs)
+
+    def play(self, sim: Simulation | None = None,
+             ) -> typing.Iterator[Simulation]:
+        """
+        Play the game again, yielding the simulation after each tick.
+
+        The game is played from the simulation's current tick (e.g.: after a
+        seek), and stops at the recorded number of ticks or at game over.
+        """
+        if sim is None:
+            sim = self.simulation()
+        return self._play(sim, self.ticks)
+
+    def _play(self, sim: Simulation, end: int) -> typing.Iterator[Simulation]:
+        """Play the game until a given tick."""
+        start = bisect.bisect_left(self.turns, sim.ticks,
+                                   key = lambda turn: turn[0])
+        turns = iter(self.turns[start:])
+        turn = next(turns, None)
+        while sim.ticks < end and not sim.game_over:
+            action = None
+            while turn is not None and turn[0] == sim.ticks:
+                action = turn[1]
+                turn = next(turns, None)
+            sim.step(action)
+            yield sim
+
+    def seek(self, tick: int, sim: Simulation | None = None) -> Simulation:
+        """
+        Get the simulation in the state it had at a given tick.
+
+        The closest keyframe before the tick is restored, and the game is
+        played from there, which takes at most a keyframe interval.
+        """
+        if sim is None:
+            sim = self.simulation()
+        tick = max(0, min(tick, self.ticks))
+        i = bisect.bisect_right(self.keyframes, tick, key = lambda k: k.tick)
+        if i > 0:
+            self.keyframes[i - 1].restore(sim)
+        elif sim.ticks > tick or sim.game_seed != self.seed:
+            sim = self.simulation()
+        for _ in self._play(sim, tick):
+            pass
+        return sim
+
+    def verify(self) -> bool:
+        """
+        Play the game headless, and check it ends with the same score.
+
+        The keyframes must match the states reached on the way too.
+        """
+        sim = self.simulation()
+        keyframes = iter(self.keyframes)
+        keyframe = next(keyframes, None)
+        for _ in self.play(sim):
+            if keyframe is not None and keyframe.tick == sim.ticks:
+                if Keyframe.capture(sim) != keyframe:
+                    return False
+                keyframe = next(keyframes, None)
+        return (keyframe is None and sim.ticks == self.ticks
+                and sim.score == self.score)
+
+class Recorder:
+    """
+    Records the turns of the current game of a simulation.
+
+    A keyframe is captured every keyframe interval ticks.
+    """
+
+    def __init__(self, sim: Simulation,
+                 keyframe_interval: int = DEF_KEYFRAME_INTERVAL) -> None:
+        """Object initialization."""
+        self._sim = sim
+        self._seed = sim.game_seed
+        self._keyframe_interval = keyframe_interval
+        self._turns: list[tuple[int, Dir]] = []
+        self._keyframes: list[Keyframe] = []
+
+    def turn(self, direction: Dir | None) -> None:
+        """Record the action given for the next tick, if it is a turn."""
+        ticks = self._sim.ticks
+        if ticks > 0 and ticks % self._keyframe_interval == 0 and (
+                not self._keyframes or self._keyframes[-1].tick != ticks):
+            self._keyframes.append(Keyframe.capture(self._sim))
+        if direction is not None and direction != self._sim.snake.dir:
+            self._turns.append((ticks, direction))
+
+    def replay(self) -> Replay:
+        """Get the replay of the game played so far."""
+        sim = self._sim
+        return Replay(seed = self._seed, nb_lines = sim.nb_lines,
+                      nb_cols = sim.nb_cols, snake_length = sim.snake_length,
+                      gameover_on_exit = sim.gameover_on_exit,
+                      turns = tuple(self._turns), ticks = sim.ticks,
+                      score = sim.score, keyframes = tuple(self._keyframes))
+
+def _play_rendered(replay: Replay, fps: int, tile_size: int) -> Simulation:
+    """Play a replay in a window."""
+    import pygame # noqa: PLC0415
+
+    from .renderer import Renderer # noqa: PLC0415
+
+    pygame.init()
+    screen = pygame.display.set_mode((replay.nb_cols * tile_size,
+                                      replay.nb_lines * tile_size))
+    renderer = Renderer(screen = screen, tile_size = tile_size)
+    clock = pygame.time.Clock()
+    sim = replay.simulation()
+    renderer.draw(sim.board)
+    pygame.display.update()
+    try:
+        for _ in replay.play(sim):
+            clock.tick(fps)
+            if any(e.type == pygame.QUIT for e in pygame.event.get()):
+                break
+            renderer.draw(sim.board)
+            pygame.display.update()
+    finally:
+        pygame.quit()
+    return sim
+
+def main(argv: list[str] | None = None) -> None:
+    """Play replays from the command line."""
+    args = read_replay_args(argv)
+    for path in args.replays:
+        replay = Replay.load(Path(path))
+        start = time.perf_counter()
+        if args.headless:
+            sim = replay.simulation()
+            for _ in replay.play(sim):
+                pass
+        else:
+            sim = _play_rendered(replay, args.fps, args.tile_size)
+        elapsed = time.perf_counter() - start
+        ok = sim.ticks == replay.ticks and sim.score == replay.score
+        print(f"{path}: {sim.ticks} ticks, score {sim.score}" # noqa: T201
+              f" (recorded {replay.score}) in {elapsed:.3f}s:"
+              f" {'OK' if ok else 'MISMATCH'}")
@@ -0,0 +1,66 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import hashlib
+import random
+import typing
+
+# Constants
+BATCH_SIZE = 256 # Number of uniform values drawn at once
+
+class Rng(random.Random):
+    """
+    Random number generator of a game.
+
+    Seeded from the given seed or, only when none is given, from the OS
+    entropy, so that a game is reproducible from its seed. Values used to
+    place fruits are drawn by batches. Independent generators for parallel
+    runs are derived from a seed with `split`.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Object initialization."""
+        self._initial_seed = 0
+        self._batch: list[float] = []
+        super().__init__(seed)
+
+    def seed(self, a: int | None = None, # type: ignore[override]
+             version: int = 2) -> None:
+        """Seed the generator, drawing a seed from the OS if none is given."""
+        if a is None:
+            a = random.SystemRandom().getrandbits(63)
+        self._initial_seed = a
+        self._batch = []
+        super().seed(a, version)
+
+    @property
+    def initial_seed(self) -> int:
+        """The seed the generator was last seeded with."""
+        return self._initial_seed
+
+    def index(self, n: int) -> int:
+        """Draw a random index in [0, n), from a batch of pre-drawn values."""
+        if not self._batch:
+            rand = self.random
+            self._batch = [rand() for _ in range(BATCH_SIZE)]
+        return int(self._batch.pop() * n)
+
+    def split(self, n: int) -> list["Rng"]:
+        """Derive n independent generators from this one's seed."""
+        return [Rng(derive_seed(self._initial_seed, i)) for i in range(n)]
+
+    def getstate(self) -> tuple[typing.Any, ...]:
+        """Get the internal state, including seed and pre-drawn values."""
+        return (super().getstate(), tuple(self._batch), self._initial_seed)
+
+    def setstate(self, state: tuple[typing.Any, ...]) -> None:
+        """Restore the internal state, including seed and pre-drawn values."""
+        base, batch, initial_seed = state
+        super().setstate(base)
+        self._batch = list(batch)
+        self._initial_seed = initial_seed
+
+def derive_seed(seed: int, index: int) -> int:
+    """Derive the seed of the index-th independent stream of a seed."""
+    digest = hashlib.blake2b(f"{seed}/{index}".encode(), digest_size = 8)
+    return int.from_bytes(digest.digest(), "big") >> 1
@@ -19,4 +19,4 @@ class Score:
         return self._score
 
     def __lt__(self, other: object) -> bool:
-        return isinstance(object, Score) and self._score < other._score
\ No newline at end of file
+        return isinstance(other, Score) and self._score < other._score
\ No newline at end of file
@@ -0,0 +1,238 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import abc
+import contextlib
+import dataclasses
+import datetime
+import sqlite3
+import typing
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError: # Not available on Windows
+    fcntl = None # type: ignore[assignment]
+
+# First party
+from .backends import SQLITE_SUFFIXES
+from .leaderboard import ScoreCounts
+from .score import Score
+from .scores import Scores
+
+# Constants
+DEF_MAX_SCORES = 5
+
+@dataclasses.dataclass(frozen = True)
+class GameRecord:
+    """The result of one game, as kept in the score history."""
+
+    name: str
+    score: int
+    width: int
+    height: int
+    fps: int
+    timestamp: datetime.datetime = dataclasses.field(
+            default_factory = lambda: datetime.datetime.now(datetime.UTC))
+
+class ScoreStore(abc.ABC):
+    """Abstract class for the storages of scores."""
+
+    def __init__(self, path: Path, max_scores: int = DEF_MAX_SCORES) -> None:
+        """Object initialization."""
+        self._path = path
+        self._max_scores = max_scores
+
+    @property
+    def path(self) -> Path:
+        """Path of the storage file."""
+        return self._path
+
+    @abc.abstractmethod
+    def load(self) -> Scores:
+        """Load the best scores, or default scores if none is stored yet."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def record(self, game: GameRecord) -> None:
+        """Store the result of a game."""
+        raise NotImplementedError
+
+    def record_many(self, games: list[GameRecord]) -> None:
+        """Store the results of several games."""
+        for game in games:
+            self.record(game)
+
+    def close(self) -> None: # noqa: B027
+        """Release the storage, if it holds any resource."""
+
+class YamlScoreStore(ScoreStore):
+    """
+    Stores the best scores in a YAML file.
+
+    Only the best scores are kept, not the whole history. Updates lock a
+    companion ".lock" file (advisory lock, where supported) while reading and
+    rewriting the scores, so several games can share the same file without
+    losing results, and the file itself is replaced atomically.
+    """
+
+    @contextlib.contextmanager
+    def _locked(self) -> typing.Iterator[None]:
+        """Hold an exclusive lock on the scores file."""
+        if fcntl is None:
+            yield
+            return
+        lock_path = self._path.with_name(self._path.name + ".lock")
+        with lock_path.open("a") as fd:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def load(self) -> Scores:
+        """
+        Load the best scores, or default scores if none is stored yet.
+
+        The file is only written when a score is recorded.
+        """
+        if not self._path.exists():
+            return Scores.default(self._max_scores)
+        return Scores.load(self._path, self._max_scores)
+
+    def record(self, game: GameRecord) -> None:
+        """Store the result of a game, if it is a high score."""
+        self.record_many([game])
+
+    def record_many(self, games: list[GameRecord]) -> None:
+        """Store the results of several games, with a single file rewrite."""
+        with self._locked():
+            scores = self.load()
+            changed = False
+            for game in games:
+                if scores.is_highscore(game.score):
+                    scores.add_score(Score(name = game.name,
+                                           score = game.score))
+                    changed = True
+            if changed:
+                scores.save(self._path)
+
+class SqliteScoreStore(ScoreStore):
+    """
+    Stores the results of all games in an SQLite database.
+
+    Every game is kept, with the board size, the speed and the time it was
+    played. Indexes on the score, on the player and score, and on the time
+    answer top scores, best score per player and date range queries without
+    reading the whole history. Each record is written in its own transaction.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            width INTEGER NOT NULL,
+            height INTEGER NOT NULL,
+            fps INTEGER NOT NULL,
+            timestamp REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS games_score ON games (score DESC);
+        CREATE INDEX IF NOT EXISTS games_name_score ON games (name, score);
+        CREATE INDEX IF NOT EXISTS games_timestamp ON games (timestamp);
+    """
+    _COLUMNS = "name, score, width, height, fps, timestamp"
+
+    def __init__(self, path: Path, max_scores: int = DEF_MAX_SCORES) -> None:
+        """Object initialization."""
+        super().__init__(path, max_scores)
+        self._conn = sqlite3.connect(path, check_same_thread = False)
+        with self._conn:
+            self._conn.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self._conn.close()
+
+    @staticmethod
+    def _to_record(row: tuple[str, int, int, int, int, float]) -> GameRecord:
+        """Convert a database row into a game record."""
+        name, score, width, height, fps, timestamp = row
+        return GameRecord(name = name, score = score, width = width,
+                          height = height, fps = fps,
+                          timestamp = datetime.datetime.fromtimestamp(
+                              timestamp, datetime.UTC))
+
+    def load(self) -> Scores:
+        """
+        Load the best scores, or default scores if none is stored yet.
+
+        New scores are ranked among all games from the number of games of each
+        score, read through the index on the score, so that no query is needed
+        afterwards.
+        """
+        top = self.top(self._max_scores)
+        if not top:
+            return Scores.default(self._max_scores)
+        counts = self._conn.execute("SELECT score, COUNT(*) FROM games"
+                                    " GROUP BY score")
+        return Scores(self._max_scores,
+                      [Score(name = g.name, score = g.score) for g in top],
+                      ScoreCounts(counts))
+
+    def record(self, game: GameRecord) -> None:
+        """Store the result of a game."""
+        self.record_many([game])
+
+    def record_many(self, games: list[GameRecord]) -> None:
+        """Store the results of several games, in a single transaction."""
+        with self._conn:
+            self._conn.executemany(
+                    f"INSERT INTO games ({self._COLUMNS})" # noqa: S608
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    [(g.name, g.score, g.width, g.height, g.fps,
+                      g.timestamp.timestamp()) for g in games])
+
+    def count(self) -> int:
+        """Count the games stored."""
+        return int(self._conn.execute(
+                "SELECT COUNT(*) FROM games").fetchone()[0])
+
+    def top(self, k: int) -> list[GameRecord]:
+        """Get the k best games, oldest first among equal scores."""
+        rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM games" # noqa: S608
+                " ORDER BY score DESC, id LIMIT ?", (k,))
+        return [self._to_record(r) for r in rows]
+
+    def best_per_player(self, k: int | None = None) -> list[tuple[str, int]]:
+        """Get the best score of each player, best players first."""
+        rows = self._conn.execute(
+                "SELECT name, MAX(score) AS best FROM games GROUP BY name"
+                " ORDER BY best DESC, name LIMIT ?",
+                (-1 if k is None else k,))
+        return [(name, best) for name, best in rows]
+
+    def between(self, start: datetime.datetime,
+                end: datetime.datetime) -> list[GameRecord]:
+        """Get the games played in [start, end), in chronological order."""
+        rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM games" # noqa: S608
+                " WHERE timestamp >= ? AND timestamp < ?"
+                " ORDER BY timestamp, id",
+                (start.timestamp(), end.timestamp()))
+        return [self._to_record(r) for r in rows]
+
+def open_score_store(path: Path, backend: str | None = None,
+                     max_scores: int = DEF_MAX_SCORES) -> ScoreStore:
+    """
+    Open a score storage.
+
+    Without an explicit backend, SQLite is used for files named *.db,
+    *.sqlite or *.sqlite3, and YAML otherwise.
+    """
+    if backend is None:
+        backend = "sqlite" if path.suffix in SQLITE_SUFFIXES else "yaml"
+    if backend == "sqlite":
+        return SqliteScoreStore(path, max_scores)
+    return YamlScoreStore(path, max_scores)
@@ -0,0 +1,68 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import queue
+import threading
+
+# First party
+from .score_store import GameRecord, ScoreStore
+
+# Constants
+DEF_MAX_PENDING = 64
+
+class ScoreWriter:
+    """
+    Stores game results in a background thread.
+
+    Results are handed over through a bounded queue, so the caller never waits
+    for the disk, unless the writer is that many results late. The writer
+    takes all the results pending at once and stores them in a single write
+    (one file rewrite or one transaction). Closing the writer stores all the
+    pending results before returning.
+    """
+
+    def __init__(self, store: ScoreStore,
+                 max_pending: int = DEF_MAX_PENDING) -> None:
+        """Object initialization."""
+        self._store = store
+        self._queue: queue.Queue[GameRecord | None] = queue.Queue(max_pending)
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target = self._run,
+                                        name = "score-writer", daemon = True)
+        self._thread.start()
+
+    def submit(self, game: GameRecord) -> None:
+        """Ask for a game result to be stored."""
+        self._queue.put(game)
+
+    def close(self) -> None:
+        """Store all pending results and stop the thread."""
+        # None asks the thread to stop
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        """Thread loop: store pending results until asked to stop."""
+        stop = False
+        while not stop:
+            # Wait for a result, then take all pending ones
+            games: list[GameRecord] = []
+            item = self._queue.get()
+            while True:
+                if item is None:
+                    stop = True
+                else:
+                    games.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            # Store them at once
+            if games:
+                try:
+                    self._store.record_many(games)
+                except Exception as e: # noqa: BLE001
+                    self._error = e
@@ -1,13 +1,41 @@
+import os
+import tempfile
 import typing
 import yaml
 from pathlib import Path
+from .leaderboard import Leaderboard
 from .score import Score
 
 
+class Ranking(typing.Protocol):
+    """Counts of many scores, to rank new scores among them."""
+
+    def __len__(self) -> int:
+        """Count the scores."""
+
+    def rank(self, score: int) -> int:
+        """Rank that a new score would get, i.e. 1 + number of better ones."""
+
+    def add(self, score: int) -> int:
+        """Add a score, and return its rank (after the equal ones)."""
+
+
 class Scores:
-    def __init__(self, max_scores: int, scores: list[Score]) -> None:
+    """
+    The best scores, as displayed on the score screen.
+
+    All added scores are also kept in a leaderboard, to tell the rank of any
+    score among all of them. When the scores come from a storage holding many
+    more than the best ones, only the best ones are given, and scores are
+    ranked among all of them through their counts instead.
+    """
+
+    def __init__(self, max_scores: int, scores: list[Score],
+                 ranking: Ranking | None = None) -> None:
         self._max_scores = max_scores
-        self._scores = sorted(scores, reverse=True)[:self._max_scores]
+        self._leaderboard = Leaderboard(scores)
+        self._scores = self._leaderboard.top(self._max_scores)
+        self._ranking = ranking
 
     @classmethod
     def default(cls, max_scores: int) -> "Scores":
@@ -16,27 +44,49 @@ class Scores:
     def __iter__(self) -> typing.Iterator[Score]:
         return iter(self._scores)
 
-
+    def __len__(self) -> int:
+        """Count the scores ever added, not only the best ones."""
+        if self._ranking is not None:
+            return len(self._ranking)
+        return len(self._leaderboard)
 
     def is_highscore(self, score_player : int) -> bool :
         """Define the case highscore."""
         return len(self._scores)<self._max_scores or score_player > self._scores[-1].score
 
-    def add_score(self, score_player: Score) -> None:
-        """Add a score and sort the list."""
-        if self.is_highscore(score_player.score):
-            if len(self._scores)>=self._max_scores :
-                self._scores.pop()
-            self._scores.append(score_player)
-            self._scores.sort(reverse=True)
+    def rank(self, score_player: int) -> int:
+        """Rank a score would get among all scores (starting at 1)."""
+        if self._ranking is not None:
+            return self._ranking.rank(score_player)
+        return self._leaderboard.rank(score_player)
+
+    def add_score(self, score_player: Score) -> int:
+        """Add a score, and return its rank among all scores."""
+        highscore = self.is_highscore(score_player.score)
+        if self._ranking is not None:
+            rank = self._ranking.add(score_player.score)
+            if highscore:
+                self._leaderboard.add(score_player)
+        else:
+            rank = self._leaderboard.add(score_player)
+        if highscore:
+            self._scores = self._leaderboard.top(self._max_scores)
+        return rank
 
     def save(self, scores_file:Path)->None:
+        """Save the best scores, replacing the file atomically."""
         x=[{"name":s.name, "score": s.score} for s in self]
-        with scores_file.open("w") as fd:
-            yaml.safe_dump(x, fd)
+        fd, tmp = tempfile.mkstemp(dir=scores_file.parent, prefix=scores_file.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                yaml.safe_dump(x, f)
+            Path(tmp).replace(scores_file)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
 
     @classmethod
-    def load(cls, scores_file:Path) -> "Scores":
+    def load(cls, scores_file:Path, max_scores: int = 5) -> "Scores":
         with scores_file.open("r") as fd:
-            scores = yaml.load(fd, Loader=yaml.Loader)
-        return cls(5, [Score(name=c["name"], score=c["score"]) for c in scores])
+            scores = yaml.safe_load(fd) or []
+        return cls(max_scores, [Score(name=c["name"], score=c["score"]) for c in scores])
@@ -0,0 +1,157 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+import contextlib
+import threading
+import time
+import typing
+
+# First party
+from .dir import Dir
+from .simulation import Simulation
+from .snapshot import Snapshot
+
+# Constants
+DEF_QUEUE_SIZE = 3 # Turns buffered for the next ticks
+MAX_LATE_TICKS = 5 # Ticks played at most to catch up with the clock
+
+Step = typing.Callable[[Dir | None], bool]
+
+class FrameBuffer:
+    """
+    Double buffer of the snapshots published by a simulation.
+
+    The writer puts a snapshot in the back slot, then swaps the slots, so that
+    readers always get the last complete snapshot, without waiting for the
+    next one. Snapshots are immutable, so a reader can keep one as long as it
+    likes. There must be a single writer.
+    """
+
+    def __init__(self, snapshot: Snapshot) -> None:
+        """Object initialization."""
+        self._slots = [snapshot, snapshot]
+        self._front = 0
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot: Snapshot) -> None:
+        """Publish a new snapshot."""
+        back = 1 - self._front
+        self._slots[back] = snapshot
+        with self._lock:
+            self._front = back
+
+    def read(self) -> Snapshot:
+        """Get the last snapshot published."""
+        with self._lock:
+            return self._slots[self._front]
+
+class SimulationWorker:
+    """
+    Runs a simulation in a background thread, at a fixed tick rate.
+
+    After each tick, the thread publishes a snapshot of the game, that the
+    render side reads without waiting for the simulation nor touching its
+    objects. Turns are queued, and one is taken per tick. The worker ticks
+    only once asked to play, and stops by itself on game over. Any other
+    change to the simulation must be made within `locked`. Closing the worker
+    stops the thread. An error in the thread stops it too, and is raised again
+    by `latest` and `close`.
+
+    By default, a tick is a step of the simulation. Another step function can
+    be given, to do more on each tick (like recording the game).
+    """
+
+    def __init__(self, sim: Simulation, fps: int, *,
+                 step: Step | None = None,
+                 queue_size: int = DEF_QUEUE_SIZE) -> None:
+        """Object initialization."""
+        self._sim = sim
+        self._tick_time = 1 / fps # In seconds
+        self._step = sim.step if step is None else step
+        self._queue_size = queue_size
+        self._turns: collections.deque[Dir] = collections.deque()
+        self._lock = threading.Lock()
+        self._buffer = FrameBuffer(sim.snapshot())
+        self._playing = threading.Event()
+        self._stopping = threading.Event()
+        self._next_tick = 0.0
+        self._error: Exception | None = None
+        self._thread = threading.Thread(target = self._run,
+                                        name = "simulation", daemon = True)
+        self._thread.start()
+
+    @property
+    def playing(self) -> bool:
+        """Tell if the worker is ticking."""
+        return self._playing.is_set()
+
+    def latest(self) -> Snapshot:
+        """Get the last snapshot of the game."""
+        if self._error is not None:
+            raise self._error
+        return self._buffer.read()
+
+    def play(self) -> None:
+        """Start ticking, the first tick being one tick from now."""
+        with self._lock:
+            self._turns.clear()
+            self._next_tick = time.perf_counter() + self._tick_time
+            self._playing.set()
+
+    def turn(self, direction: Dir) -> None:
+        """Queue a turn for the next ticks, unless it changes nothing."""
+        with self._lock:
+            last = self._turns[-1] if self._turns else self._sim.snake.dir
+            if direction != last and len(self._turns) < self._queue_size:
+                self._turns.append(direction)
+
+    @contextlib.contextmanager
+    def locked(self) -> typing.Iterator[Simulation]:
+        """Hold the ticks to change the simulation, then publish its state."""
+        with self._lock:
+            yield self._sim
+            self._buffer.publish(self._sim.snapshot())
+
+    def close(self) -> None:
+        """Stop the thread."""
+        self._stopping.set()
+        self._playing.set() # Wake the thread up
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        """Thread loop: tick on time while playing, until asked to stop."""
+        try:
+            while True:
+                self._playing.wait()
+                if self._stopping.is_set():
+                    break
+
+                # Sleep until the next tick, waking up to stop
+                delay = self._next_tick - time.perf_counter()
+                if delay > 0:
+                    self._stopping.wait(delay)
+                    continue
+
+                with self._lock:
+                    self._tick()
+        except Exception as e: # noqa: BLE001
+            self._error = e
+            self._playing.clear()
+
+    def _tick(self) -> None:
+        """Advance the game by one tick, and publish its new state."""
+        action = self._turns.popleft() if self._turns else None
+        game_over = self._step(action)
+        self._buffer.publish(self._sim.snapshot())
+        if game_over:
+            self._playing.clear()
+            self._turns.clear()
+
+        # Too late, give up catching up
+        self._next_tick += self._tick_time
+        now = time.perf_counter()
+        if now - self._next_tick > MAX_LATE_TICKS * self._tick_time:
+            self._next_tick = now
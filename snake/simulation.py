@@ -0,0 +1,249 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import copy
+
+# First party
+from .board import Board
+from .color import Color
+from .dir import Dir
+from .exceptions import GameOver
+from .fruit import Fruit
+from .rng import Rng, derive_seed
+from .snake import DEF_BODY_COLOR, DEF_HEAD_COLOR, Snake
+from .snapshot import Snapshot
+from .tile import Tile
+from .topology import Topology
+
+# Constants
+SK_START_LENGTH = 3
+
+class Simulation:
+    """
+    Headless game engine.
+
+    Holds the board, the snake and the fruit, and advances the game one tick
+    at a time. It never touches pygame, so it can be stepped without any
+    display.
+
+    Each game has its own seed: the first game uses the simulation's seed, and
+    the following ones seeds derived from it. A game can therefore be played
+    again from its seed alone.
+
+    The state of the current game can be saved as an immutable snapshot and
+    restored later, or in another simulation of the same size. A simulation
+    can also be forked, to explore futures without touching the game.
+    """
+
+    def __init__(self, nb_lines: int, nb_cols: int, # noqa: PLR0913
+                 *,
+                 snake_length: int = SK_START_LENGTH,
+                 fruit_color: Color | None = None,
+                 snake_head_color: Color = DEF_HEAD_COLOR,
+                 snake_body_color: Color = DEF_BODY_COLOR,
+                 gameover_on_exit: bool = False,
+                 track_dirty: bool = False,
+                 seed: int | None = None) -> None:
+        """Object initialization."""
+        self._rng = Rng(seed)
+        self._seed = self._rng.initial_seed
+        self._games = 0
+        self._nb_lines = nb_lines
+        self._nb_cols = nb_cols
+        self._snake_length = snake_length
+        self._snake_head_color = snake_head_color
+        self._snake_body_color = snake_body_color
+        self._fruit_color = fruit_color
+        self._gameover_on_exit = gameover_on_exit
+        self._board = Board(nb_lines = nb_lines, nb_cols = nb_cols,
+                            fruit_color = fruit_color,
+                            rng = self._rng,
+                            track_dirty = track_dirty)
+        self._snake: Snake | None = None
+        self._ticks = 0
+        self._game_over = False
+        self._cause: str | None = None
+        self.reset()
+
+    @property
+    def board(self) -> Board:
+        """The board holding all game objects."""
+        return self._board
+
+    @property
+    def snake(self) -> Snake:
+        """The snake."""
+        assert self._snake is not None # noqa: S101
+        return self._snake
+
+    @property
+    def seed(self) -> int:
+        """The seed of the simulation, which is the seed of the first game."""
+        return self._seed
+
+    @property
+    def game_seed(self) -> int:
+        """The seed of the current game."""
+        return self._rng.initial_seed
+
+    @property
+    def nb_lines(self) -> int:
+        """Number of lines of the board."""
+        return self._nb_lines
+
+    @property
+    def nb_cols(self) -> int:
+        """Number of columns of the board."""
+        return self._nb_cols
+
+    @property
+    def snake_length(self) -> int:
+        """Length of the snake at the start of a game."""
+        return self._snake_length
+
+    @property
+    def gameover_on_exit(self) -> bool:
+        """Tell if exiting the board ends the game."""
+        return self._gameover_on_exit
+
+    @property
+    def game_over(self) -> bool:
+        """Tell if the game is over."""
+        return self._game_over
+
+    @property
+    def cause(self) -> str | None:
+        """Why the game is over, or None if it is not."""
+        return self._cause
+
+    @property
+    def ticks(self) -> int:
+        """Number of ticks played since the last reset."""
+        return self._ticks
+
+    @property
+    def score(self) -> int:
+        """Current score, i.e.: the snake's length."""
+        return self.snake.length
+
+    @property
+    def fruit(self) -> Tile | None:
+        """The tile of the fruit, or None if there is none."""
+        for obj in self._board.objects:
+            if isinstance(obj, Fruit):
+                return next(obj.tiles)
+        return None
+
+    def snapshot(self) -> Snapshot:
+        """Save the state of the current game."""
+        nb_cols = self._nb_cols
+        fruit = self.fruit
+        return Snapshot(nb_lines = self._nb_lines, nb_cols = nb_cols,
+                        body = tuple(t.y * nb_cols + t.x
+                                     for t in self.snake.tiles),
+                        direction = self.snake.dir,
+                        fruit = None if fruit is None
+                        else fruit.y * nb_cols + fruit.x,
+                        ticks = self._ticks,
+                        game_over = self._game_over,
+                        cause = self._cause,
+                        rng_state = self._rng.getstate())
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Put the current game back in a saved state."""
+        if (snapshot.nb_lines, snapshot.nb_cols) != (self._nb_lines,
+                                                     self._nb_cols):
+            msg = (f"Cannot restore a {snapshot.nb_cols}x{snapshot.nb_lines}"
+                   f" game on a {self._nb_cols}x{self._nb_lines} board.")
+            raise ValueError(msg)
+
+        if self._snake is not None:
+            self._board.remove_object(self._snake)
+        for obj in list(self._board.objects):
+            self._board.remove_object(obj)
+
+        tiles = [Tile.get(*snapshot.coords(c), self._snake_body_color)
+                 for c in snapshot.body]
+        tiles[0] = tiles[0].with_color(self._snake_head_color)
+        self._snake = Snake(tiles, snapshot.direction,
+                            gameover_on_exit = self._gameover_on_exit,
+                            topology = Topology.get(
+                                self._nb_lines, self._nb_cols,
+                                wrap = not self._gameover_on_exit))
+        self._board.add_object(self._snake)
+        if snapshot.fruit is not None:
+            self._board.place_fruit(*snapshot.coords(snapshot.fruit))
+
+        self._rng.setstate(snapshot.rng_state)
+        self._ticks = snapshot.ticks
+        self._game_over = snapshot.game_over
+        self._cause = snapshot.cause
+
+    def fork(self) -> "Simulation":
+        """
+        Create an independent copy of the simulation, in the same state.
+
+        The copy does not track dirty cells. To explore many futures,
+        restoring snapshots in a single fork is cheaper than forking again.
+        """
+        # Share the settings, but not the game objects
+        sim = copy.copy(self)
+        sim._rng = Rng(self._seed) # noqa: SLF001
+        sim._board = Board(nb_lines = self._nb_lines, # noqa: SLF001
+                           nb_cols = self._nb_cols,
+                           fruit_color = self._fruit_color,
+                           rng = sim._rng) # noqa: SLF001
+        sim._snake = None # noqa: SLF001
+        sim.restore(self.snapshot())
+        return sim
+
+    def reset(self) -> None:
+        """Start a new game with a new snake."""
+        if self._games > 0:
+            self._rng.seed(derive_seed(self._seed, self._games))
+        self._games += 1
+
+        if self._snake is not None:
+            self._board.remove_object(self._snake)
+        self._snake = Snake.create_random(
+                nb_lines = self._nb_lines,
+                nb_cols = self._nb_cols,
+                length = self._snake_length,
+                head_color = self._snake_head_color,
+                body_color = self._snake_body_color,
+                gameover_on_exit = self._gameover_on_exit,
+                rng = self._rng,
+                )
+        self._board.add_object(self._snake)
+
+        # Make sure there is exactly one fruit
+        for obj in list(self._board.objects):
+            if obj is not self._snake:
+                self._board.remove_object(obj)
+        self._board.create_fruit()
+
+        self._ticks = 0
+        self._game_over = False
+        self._cause = None
+
+    def step(self, action: Dir | None = None) -> bool:
+        """
+        Advance the game by one tick.
+
+        If an action is given, the snake turns in that direction before
+        moving. Return True if the game is over.
+        """
+        if self._game_over:
+            return True
+
+        if action is not None:
+            self.snake.dir = action
+
+        try:
+            self.snake.move()
+        except GameOver as e:
+            self._game_over = True
+            self._cause = e.cause
+        self._ticks += 1
+
+        return self._game_over
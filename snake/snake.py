@@ -1,34 +1,50 @@
 # ruff: noqa: D100,S311
 
 # Standard
+import collections
 import random
 import typing
 
-# Third party
-import pygame
-
 # First party
+from .color import Color
 from .dir import Dir
-from .exceptions import GameOver
+from .exceptions import CAUSE_EXIT, GameOver
 from .fruit import Fruit
 from .game_object import GameObject
+from .rng import Rng
 from .tile import Tile
+from .topology import WALL, Topology
 
 # Constants
-DEF_HEAD_COLOR = pygame.Color("green")
-DEF_BODY_COLOR = pygame.Color("darkgreen")
+DEF_HEAD_COLOR: Color = (0, 255, 0)
+DEF_BODY_COLOR: Color = (0, 100, 0)
 
 class Snake(GameObject):
-    """The snake."""
+    """
+    The snake.
+
+    The body is stored in a deque, head first, together with the set of
+    tiles it covers, so that moving, growing and detecting
+    self-collisions do not depend on the snake's length.
+
+    When given the board topology, the snake finds its next head with a table
+    lookup, wrapping around or hitting walls by itself. Otherwise, it relies
+    on the board to notify it when it exits.
+    """
 
     def __init__(self, tiles: list[Tile], direction: Dir, *,
-                 gameover_on_exit: bool = False) -> None:
+                 gameover_on_exit: bool = False,
+                 topology: Topology | None = None) -> None:
         """Object initialization."""
         super().__init__()
-        self._tiles = tiles
+        self._tiles = collections.deque(tiles)
+        self._cells = set(tiles)
         self._dir = direction
         self._length = len(tiles)
         self._gameover_on_exit = gameover_on_exit
+        self._topology = topology
+        if topology is not None:
+            self._head_cell = topology.cell(tiles[0].x, tiles[0].y)
 
     @property
     def length(self) -> int:
@@ -52,11 +68,24 @@ class Snake(GameObject):
     def notify_out_of_board(self, width: int, height: int) -> None:
         """Snake has exited the board."""
         if self._gameover_on_exit:
-            raise GameOver
+            raise GameOver(CAUSE_EXIT)
 
         # Only the head has exited
-        self._tiles[0].x = self._tiles[0].x % width
-        self._tiles[0].y = self._tiles[0].y % height
+        head = self._tiles[0]
+        self._cells.discard(head)
+        head = Tile.get(head.x % width, head.y % height, head.color)
+
+        # Slither on itself after wrapping around?
+        if head in self._cells:
+            raise GameOver
+        self._tiles[0] = head
+        self._cells.add(head)
+
+    def __contains__(self, other: object) -> bool:
+        """Check if an game object intersects with the snake."""
+        if not isinstance(other, GameObject):
+            return False
+        return any(t in self._cells for t in other.tiles)
 
     def notify_collision(self, obj: GameObject) -> None:
         """Notify that an object collides with another."""
@@ -72,53 +101,67 @@ class Snake(GameObject):
     def move(self) -> None:
         """Let the snake advance."""
         # Create new head
-        new_head = self._tiles[0] + self._dir
+        if self._topology is None:
+            new_head = self._tiles[0] + self._dir
+        else:
+            cell = self._topology.next_cell(self._head_cell, self._dir)
+            if cell == WALL:
+                raise GameOver(CAUSE_EXIT)
+            x, y = self._topology.coords(cell)
+            new_head = Tile.get(x, y, self._tiles[0].color)
 
         # Slither on itself?
-        if new_head in self._tiles:
+        if new_head in self._cells:
             raise GameOver
+        if self._topology is not None:
+            self._head_cell = cell
 
         # Current head changes color
-        self._tiles[0].color = self._tiles[-1].color
+        self._tiles[0] = self._tiles[0].with_color(self._tiles[-1].color)
 
         # Insert new head
-        self._tiles.insert(0, new_head)
+        self._tiles.appendleft(new_head)
+        self._cells.add(new_head)
 
         # Notify movement
         for obs in self.observers:
             obs.notify_object_moved(self)
 
         # Remove queue tiles if needed
-        if len(self._tiles) > self._length:
-            del self._tiles[self._length:]
+        while len(self._tiles) > self._length:
+            tile = self._tiles.pop()
+            self._cells.discard(tile)
+            for obs in self.observers:
+                obs.notify_tile_freed(self, tile)
 
     # Create a Snake at random position on the board
     @classmethod
     def create_random(cls, nb_lines: int, nb_cols: int, # noqa: PLR0913
                       length: int,
                       *,
-                      head_color: pygame.Color = DEF_HEAD_COLOR,
-                      body_color: pygame.Color = DEF_BODY_COLOR,
-                      gameover_on_exit: bool = False) -> typing.Self:
+                      head_color: Color = DEF_HEAD_COLOR,
+                      body_color: Color = DEF_BODY_COLOR,
+                      gameover_on_exit: bool = False,
+                      rng: random.Random | None = None) -> typing.Self:
         """Create a snake and place it randomly on the board."""
         tiles = [] # List of tuples (col_index, line_index)
+        if rng is None:
+            rng = Rng()
 
         # Choose head
-        random.seed()
-        x = random.randint(length - 1, nb_cols - length)
-        y = random.randint(length - 1, nb_lines - length)
-        tiles.append(Tile(x, y, head_color))
+        x = rng.randint(length - 1, nb_cols - length)
+        y = rng.randint(length - 1, nb_lines - length)
+        tiles.append(Tile.get(x, y, head_color))
 
         # Choose body orientation (i.e.: in which direction the snake will move)
-        random.seed()
-        snake_dir = random.sample([Dir.LEFT, Dir.RIGHT, Dir.UP, Dir.DOWN], 1)[0]
+        snake_dir = rng.sample([Dir.LEFT, Dir.RIGHT, Dir.UP, Dir.DOWN], 1)[0]
 
         # Create body
         while len(tiles) < length:
-            tile = tiles[-1] - snake_dir
-            tile.color = body_color
-            tiles.append(tile)
+            tiles.append((tiles[-1] - snake_dir).with_color(body_color))
 
+        topology = Topology.get(nb_lines, nb_cols,
+                                wrap = not gameover_on_exit)
         return cls(tiles, direction = snake_dir,
-                   gameover_on_exit = gameover_on_exit)
+                   gameover_on_exit = gameover_on_exit, topology = topology)
 
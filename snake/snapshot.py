@@ -0,0 +1,39 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import dataclasses
+import typing
+
+# First party
+from .dir import Dir
+
+@dataclasses.dataclass(frozen = True, slots = True)
+class Snapshot:
+    """
+    The state of a game at a given tick.
+
+    A snapshot is an immutable value made of plain data only, without any link
+    to the game objects, so it can be shared instead of copied, and pickled to
+    be sent to another process. Cells are indexed as y * nb_cols + x. The
+    snake's length is the length of its body.
+    """
+
+    nb_lines: int
+    nb_cols: int
+    body: tuple[int, ...] # Cells of the snake, head first
+    direction: Dir
+    fruit: int | None # Cell of the fruit
+    ticks: int
+    game_over: bool
+    cause: str | None
+    rng_state: tuple[typing.Any, ...]
+
+    @property
+    def length(self) -> int:
+        """Length of the snake."""
+        return len(self.body)
+
+    def coords(self, cell: int) -> tuple[int, int]:
+        """Get the (x, y) coordinates of a cell."""
+        y, x = divmod(cell, self.nb_cols)
+        return x, y
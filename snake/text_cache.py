@@ -0,0 +1,66 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+
+# Third party
+import pygame
+
+# First party
+from .color import Color
+
+# Constants
+DEF_MAX_SIZE = 256 # Number of text surfaces kept
+
+class TextCache:
+    """
+    Rendered text surfaces, keyed on font, text and color.
+
+    Rendering text with a font is expensive, and the same texts are drawn
+    again and again, so surfaces are kept and reused. When the cache is full,
+    the least recently used surface is dropped.
+    """
+
+    def __init__(self, max_size: int = DEF_MAX_SIZE) -> None:
+        """Object initialization."""
+        self._max_size = max_size
+        self._surfaces: collections.OrderedDict[
+                tuple[pygame.font.Font, str, Color], pygame.Surface] = (
+                collections.OrderedDict())
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        """Count the surfaces kept."""
+        return len(self._surfaces)
+
+    @property
+    def hits(self) -> int:
+        """Number of texts found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Number of texts that had to be rendered."""
+        return self._misses
+
+    def render(self, font: pygame.font.Font, text: str,
+               color: Color) -> pygame.Surface:
+        """Get the surface of a text, rendering it if needed."""
+        key = (font, text, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self._hits += 1
+            return surface
+
+        self._misses += 1
+        surface = font.render(text, True, color) # noqa: FBT003
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self._max_size:
+            self._surfaces.popitem(last = False)
+        return surface
+
+    def clear(self) -> None:
+        """Drop all surfaces."""
+        self._surfaces.clear()
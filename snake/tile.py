@@ -1,54 +1,70 @@
 # ruff: noqa: D100,S311
 
-# Third party
-import pygame
+# Standard
+import typing
 
 # First party
+from .color import Color
 from .dir import Dir
 
+# Constants
+MAX_POOL_SIZE = 1 << 16 # Interned tiles kept at most
 
 class Tile:
     """
     A square tile in the game.
 
-    Includes a color.
+    Includes a color. Tiles are immutable and hashable: equality and hash only
+    depend on the x and y coordinates, not on the color.
+
+    Tiles are small (no instance dictionary) and a pool interns them: `get`
+    returns the same object for the same coordinates and color value, so tiles
+    of a bounded board are only allocated once. The pool is emptied when it
+    grows too large, in case colors keep changing.
     """
 
-    def __init__(self, x: int, y: int, color: pygame.Color) -> None:
+    __slots__ = ("_color", "_hash", "_x", "_y")
+
+    # Interned tiles, by coordinates and color value (pygame colors are not
+    # hashable, so colors other than strings are keyed as tuples)
+    _pool: typing.ClassVar[dict[tuple[int, int, typing.Hashable], "Tile"]] = {}
+
+    def __init__(self, x: int, y: int, color: Color) -> None:
         """Object initialization."""
         self._x = x # Column index
         self._y = y # Line index
         self._color = color
+        self._hash = hash((x, y))
+
+    @classmethod
+    def get(cls, x: int, y: int, color: Color) -> "Tile":
+        """Get the interned tile with these coordinates and color."""
+        key = (x, y, color if isinstance(color, str) else tuple(color))
+        tile = cls._pool.get(key)
+        if tile is None:
+            if len(cls._pool) >= MAX_POOL_SIZE:
+                cls._pool.clear()
+            tile = cls._pool[key] = cls(x, y, color)
+        return tile
 
     @property
     def x(self) -> int:
         """The x coordinate (i.e.: column index) of the tile."""
         return self._x
 
-    @x.setter
-    def x(self, value: int) -> None:
-        """Set the x coordinate."""
-        self._x = value
-
     @property
     def y(self) -> int:
         """The y coordinate (i.e.: line index) of the tile."""
         return self._y
 
-    @y.setter
-    def y(self, value: int) -> None:
-        """Set the y coordinate."""
-        self._y = value
-
     @property
-    def color(self) -> pygame.Color:
+    def color(self) -> Color:
         """The color of the tile."""
         return self._color
 
-    @color.setter
-    def color(self, color: pygame.Color) -> None:
-        """Change the color of the tile."""
-        self._color = color
+    def with_color(self, color: Color) -> "Tile":
+        """Get the tile at the same position with another color."""
+        return Tile.get(self._x, self._y, color)
 
     def __eq__(self, other: object) -> bool:
         """
@@ -60,23 +76,26 @@ class Tile:
             return self._x == other._x and self._y == other._y
         return False
 
+    def __hash__(self) -> int:
+        """Hash of the x and y coordinates."""
+        return self._hash
+
+    def __repr__(self) -> str:
+        """Representation of the tile."""
+        return f"Tile({self._x}, {self._y}, {self._color!r})"
+
     def __add__(self, other: object) -> "Tile":
         """Add two tiles together or a tile with a direction."""
         if isinstance(other, (Tile, Dir)):
-            return Tile(x = self.x + other.x, y = self.y + other.y,
-                        color = self.color)
+            return Tile.get(x = self.x + other.x, y = self.y + other.y,
+                            color = self.color)
         msg = f"Wrong object type {type(object)}."
         raise ValueError(msg)
 
     def __sub__(self, other: object) -> "Tile":
         """Substract a tile or a direction to this tile."""
         if isinstance(other, (Tile, Dir)):
-            return Tile(x = self.x - other.x, y = self.y - other.y,
-                        color = self.color)
+            return Tile.get(x = self.x - other.x, y = self.y - other.y,
+                            color = self.color)
         msg = f"Wrong object type {type(object)}."
         raise ValueError(msg)
-
-    def draw(self, screen: pygame.Surface, size: int) -> None:
-        """Draw the tile on screen."""
-        rect = pygame.Rect(self.x * size, self.y * size, size, size)
-        pygame.draw.rect(screen, self.color, rect)
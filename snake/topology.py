@@ -0,0 +1,82 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import typing
+
+# First party
+from .dir import Dir
+
+# Sentinel for a move that hits a wall
+WALL = -1
+
+class Topology:
+    """
+    Precomputed neighbor tables of a board.
+
+    Cells are indexed as y * nb_cols + x. For each direction, a table gives the
+    cell reached when moving from any cell: on a torus the board wraps around,
+    otherwise moving out of the board gives WALL. A move is then a single
+    table lookup.
+
+    Topologies only depend on the board size and kind, so `get` creates each
+    one once and shares it.
+    """
+
+    _cache: typing.ClassVar[dict[tuple[int, int, bool], "Topology"]] = {}
+
+    def __init__(self, nb_lines: int, nb_cols: int, *, wrap: bool) -> None:
+        """Object initialization."""
+        self._nb_lines = nb_lines
+        self._nb_cols = nb_cols
+        self._wrap = wrap
+        self._coords = [(c % nb_cols, c // nb_cols)
+                        for c in range(nb_lines * nb_cols)]
+        self._next = {d: [self._neighbor(x, y, d) for x, y in self._coords]
+                      for d in Dir}
+
+    @classmethod
+    def get(cls, nb_lines: int, nb_cols: int, *, wrap: bool) -> "Topology":
+        """Get the shared topology for this board size and kind."""
+        key = (nb_lines, nb_cols, wrap)
+        topology = cls._cache.get(key)
+        if topology is None:
+            topology = cls._cache[key] = cls(nb_lines, nb_cols, wrap = wrap)
+        return topology
+
+    def _neighbor(self, x: int, y: int, direction: Dir) -> int:
+        """Compute the cell reached from (x, y) in a direction."""
+        x += direction.x
+        y += direction.y
+        if self._wrap:
+            x %= self._nb_cols
+            y %= self._nb_lines
+        elif not (0 <= x < self._nb_cols and 0 <= y < self._nb_lines):
+            return WALL
+        return self.cell(x, y)
+
+    @property
+    def nb_lines(self) -> int:
+        """Number of lines of the board."""
+        return self._nb_lines
+
+    @property
+    def nb_cols(self) -> int:
+        """Number of columns of the board."""
+        return self._nb_cols
+
+    @property
+    def wrap(self) -> bool:
+        """Tell if the board wraps around (torus) or is walled."""
+        return self._wrap
+
+    def cell(self, x: int, y: int) -> int:
+        """Index of the cell at (x, y)."""
+        return y * self._nb_cols + x
+
+    def coords(self, cell: int) -> tuple[int, int]:
+        """Coordinates (x, y) of a cell."""
+        return self._coords[cell]
+
+    def next_cell(self, cell: int, direction: Dir) -> int:
+        """Cell reached by moving from a cell in a direction, or WALL."""
+        return self._next[direction][cell]
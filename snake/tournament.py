@@ -0,0 +1,144 @@
+# ruff: noqa: D100,S311
+
+# Standard
+import collections
+import concurrent.futures
+import dataclasses
+import importlib
+import statistics
+import typing
+from pathlib import Path
+
+# First party
+from .cmd_line import read_tournament_args
+from .dir import Dir
+from .score import Score
+from .scores import Scores
+from .simulation import Simulation
+
+# An agent chooses the next direction of the snake, or None to keep going
+Agent = typing.Callable[[Simulation], Dir | None]
+
+# Cause of game over for games stopped after the maximum number of ticks
+CAUSE_TIMEOUT = "timeout"
+
+@dataclasses.dataclass(frozen = True)
+class GameResult:
+    """The result of one headless game played by an agent."""
+
+    agent: str
+    seed: int
+    length: int
+    ticks: int
+    cause: str
+
+def greedy(sim: Simulation) -> Dir | None:
+    """Go straight to the fruit, avoiding to turn back on the neck."""
+    tiles = sim.snake.tiles
+    head = next(tiles)
+    neck = next(tiles, None)
+    fruit = next(next(o.tiles) for o in sim.board.objects
+                 if o is not sim.snake)
+    for d in Dir:
+        target = head + d
+        if neck is not None and target == neck:
+            continue
+        if ((d.x and (fruit.x - head.x) * d.x > 0) or
+                (d.y and (fruit.y - head.y) * d.y > 0)):
+            return d
+    return None
+
+def load_agent(spec: str) -> Agent:
+    """Load an agent given as "module:function"."""
+    module, _, name = spec.partition(":")
+    agent = getattr(importlib.import_module(module), name)
+    return typing.cast(Agent, agent)
+
+def play(name: str, spec: str, seed: int, *, # noqa: PLR0913
+         nb_lines: int, nb_cols: int,
+         gameover_on_exit: bool, max_ticks: int) -> GameResult:
+    """Play one headless game with an agent."""
+    agent = load_agent(spec)
+    sim = Simulation(nb_lines = nb_lines, nb_cols = nb_cols,
+                     gameover_on_exit = gameover_on_exit, seed = seed)
+    while sim.ticks < max_ticks:
+        if sim.step(agent(sim)):
+            break
+    return GameResult(agent = name, seed = seed, length = sim.score,
+                      ticks = sim.ticks, cause = sim.cause or CAUSE_TIMEOUT)
+
+def run_tournament(agents: dict[str, str], seeds: list[int], *, # noqa: PLR0913
+                   nb_lines: int, nb_cols: int, gameover_on_exit: bool,
+                   max_ticks: int, workers: int | None = None,
+                   ) -> typing.Iterator[GameResult]:
+    """
+    Play every agent on every seed, across a pool of processes.
+
+    Agents are given as "module:function" specifications, so they can be
+    loaded in the worker processes. Results are yielded as soon as games end.
+    """
+    with concurrent.futures.ProcessPoolExecutor(max_workers = workers) as pool:
+        futures = [pool.submit(play, name, spec, seed, nb_lines = nb_lines,
+                               nb_cols = nb_cols,
+                               gameover_on_exit = gameover_on_exit,
+                               max_ticks = max_ticks)
+                   for name, spec in agents.items() for seed in seeds]
+        for future in concurrent.futures.as_completed(futures):
+            yield future.result()
+
+class Aggregator:
+    """Collects game results and builds a leaderboard of the agents."""
+
+    def __init__(self) -> None:
+        """Object initialization."""
+        self._results: dict[str, list[GameResult]] = collections.defaultdict(
+                list)
+
+    def add(self, result: GameResult) -> None:
+        """Add the result of a game."""
+        self._results[result.agent].append(result)
+
+    def leaderboard(self) -> list[tuple[str, float, int, float,
+                                        dict[str, int]]]:
+        """
+        Get the agents ranked by mean final length.
+
+        Each entry gives the agent name, the mean and best lengths, the mean
+        number of ticks and the count of each cause of game over.
+        """
+        board = [(name,
+                  statistics.fmean(r.length for r in results),
+                  max(r.length for r in results),
+                  statistics.fmean(r.ticks for r in results),
+                  dict(collections.Counter(r.cause for r in results)))
+                 for name, results in self._results.items()]
+        return sorted(board, key = lambda e: e[1], reverse = True)
+
+    def scores(self) -> Scores:
+        """Get the leaderboard as scores, the score being the mean length."""
+        board = self.leaderboard()
+        return Scores(len(board), [Score(name = name, score = round(mean))
+                                   for name, mean, *_ in board])
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a tournament from the command line."""
+    args = read_tournament_args(argv)
+    aggregator = Aggregator()
+
+    for result in run_tournament(dict(args.agent), args.seeds,
+                                 nb_lines = args.height, nb_cols = args.width,
+                                 gameover_on_exit = args.gameover_on_exit,
+                                 max_ticks = args.max_ticks,
+                                 workers = args.workers):
+        aggregator.add(result)
+        if not args.quiet:
+            print(f"{result.agent} seed={result.seed} length={result.length}" # noqa: T201
+                  f" ticks={result.ticks} cause={result.cause}")
+
+    for rank, (name, mean, best, ticks, causes) in enumerate(
+            aggregator.leaderboard(), start = 1):
+        print(f"#{rank} {name}: mean length {mean:.1f}, best {best}," # noqa: T201
+              f" mean ticks {ticks:.0f}, {causes}")
+
+    if args.scores_file is not None:
+        aggregator.scores().save(Path(args.scores_file))
@@ -1,6 +1,8 @@
-# ruff: noqa: D100,D103,I001,S101,PLR2004
+# ruff: noqa: D100,D103,I001,S101,PLR2004,SLF001
 import snake
+from snake import tile
 import pygame
+import pytest
 
 def test_tile_creation() -> None:
     black = pygame.Color("black")
@@ -42,3 +44,44 @@ def test_tile_sub() -> None:
     assert (t1 - snake.Dir.DOWN) == snake.Tile(1, 1, black)
     assert (t1 - snake.Dir.LEFT) == snake.Tile(2, 2, black)
     assert (t1 - snake.Dir.RIGHT) == snake.Tile(0, 2, black)
+
+def test_tile_hash() -> None:
+    black = pygame.Color("black")
+    white = pygame.Color("white")
+    tiles = {snake.Tile(1, 2, black), snake.Tile(1, 2, white),
+             snake.Tile(2, 1, black)}
+    assert len(tiles) == 2
+    assert snake.Tile(1, 2, white) in tiles
+    assert {snake.Tile(1, 2, black): 1}[snake.Tile(1, 2, white)] == 1
+
+def test_tile_immutable() -> None:
+    tile = snake.Tile(1, 2, pygame.Color("black"))
+    with pytest.raises(AttributeError):
+        tile.x = 3 # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        tile.other = 3 # type: ignore[attr-defined]
+
+def test_tile_pool() -> None:
+    black = (0, 0, 0)
+    white = (255, 255, 255)
+    assert snake.Tile.get(1, 2, black) is snake.Tile.get(1, 2, black)
+    assert snake.Tile.get(1, 2, black) is not snake.Tile.get(1, 2, white)
+    assert snake.Tile.get(1, 2, white).color == white
+    assert snake.Tile.get(1, 2, black) + snake.Dir.UP is snake.Tile.get(
+            1, 1, black)
+    assert snake.Tile.get(1, 2, black).with_color(white) is snake.Tile.get(
+            1, 2, white)
+
+def test_tile_pool_color_value(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Equal colors built apart share their tiles
+    assert snake.Tile.get(1, 2, pygame.Color("red")) is snake.Tile.get(
+            1, 2, pygame.Color("red"))
+    assert snake.Tile.get(1, 2, "#ff0000") is snake.Tile.get(
+            1, 2, "".join(["#ff", "0000"]))
+
+    # The pool does not grow without bound
+    monkeypatch.setattr(tile, "MAX_POOL_SIZE", 10)
+    monkeypatch.setattr(snake.Tile, "_pool", {})
+    for i in range(100):
+        snake.Tile.get(0, 0, (i, i, i))
+    assert len(snake.Tile._pool) <= 10
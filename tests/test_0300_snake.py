@@ -1,6 +1,8 @@
 # ruff: noqa: D100,D103,I001,S101,PLR2004
 import snake
 import pygame
+import pytest
+from snake.exceptions import GameOver
 
 def test_snake_creation() -> None:
     green = pygame.Color("green")
@@ -51,3 +53,28 @@ def test_in_op() -> None:
     assert snake.Fruit(snake.Tile(0,11,green)) in snk
     assert snake.Fruit(snake.Tile(0,12,green)) in snk
     assert snake.Fruit(snake.Tile(0,13,green)) not in snk
+
+def test_snake_self_collision() -> None:
+    green = pygame.Color("green")
+    snk = snake.Snake([snake.Tile(1,1,green), snake.Tile(2,1,green),
+                       snake.Tile(2,2,green), snake.Tile(1,2,green),
+                       snake.Tile(0,2,green)], snake.Dir.DOWN)
+    with pytest.raises(GameOver):
+        snk.move()
+
+def test_snake_follows_its_tail() -> None:
+    green = pygame.Color("green")
+    snk = snake.Snake([snake.Tile(1,1,green), snake.Tile(2,1,green),
+                       snake.Tile(2,2,green), snake.Tile(1,2,green)],
+                      snake.Dir.DOWN)
+    with pytest.raises(GameOver):
+        snk.move()
+    snk = snake.Snake([snake.Tile(1,1,green), snake.Tile(2,1,green),
+                       snake.Tile(2,2,green), snake.Tile(1,2,green),
+                       snake.Tile(0,2,green)], snake.Dir.UP)
+    for _ in range(10):
+        snk.move()
+    assert len(list(snk.tiles)) == 5
+    assert snake.Fruit(snake.Tile(1,-9,green)) in snk
+    assert snake.Fruit(snake.Tile(1,-5,green)) in snk
+    assert snake.Fruit(snake.Tile(1,-4,green)) not in snk
@@ -0,0 +1,54 @@
+# ruff: noqa: D100,D103,I001,S101,S603,PLR2004
+import subprocess
+import sys
+
+import snake
+
+def test_simulation_no_pygame() -> None:
+    code = ("import sys, snake; snake.Simulation(12, 24).step();"
+            " sys.exit('pygame' in sys.modules)")
+    assert subprocess.run([sys.executable, "-c", code],
+                          check = False).returncode == 0
+
+def test_simulation_creation() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24)
+    assert sim.snake.length == 3
+    assert sim.ticks == 0
+    assert not sim.game_over
+    assert len(list(sim.board.objects)) == 2
+
+def test_simulation_step() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24)
+    head = next(sim.snake.tiles)
+    direction = sim.snake.dir
+    assert not sim.step()
+    new_head = next(sim.snake.tiles)
+    assert new_head == head + direction
+    assert sim.ticks == 1
+
+def test_simulation_wrap_around() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24)
+    for _ in range(100):
+        sim.step()
+    for tile in sim.snake.tiles:
+        assert 0 <= tile.x < 24
+        assert 0 <= tile.y < 12
+
+def test_simulation_reverse_is_game_over() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24)
+    back = {snake.Dir.UP: snake.Dir.DOWN, snake.Dir.DOWN: snake.Dir.UP,
+            snake.Dir.LEFT: snake.Dir.RIGHT,
+            snake.Dir.RIGHT: snake.Dir.LEFT}[sim.snake.dir]
+    assert sim.step(back)
+    assert sim.game_over
+    assert sim.step()
+    sim.reset()
+    assert not sim.game_over
+
+def test_simulation_gameover_on_exit() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24,
+                           gameover_on_exit = True)
+    ticks = 0
+    while not sim.step():
+        ticks += 1
+        assert ticks <= 24
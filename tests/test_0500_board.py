@@ -0,0 +1,65 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pytest
+
+import snake
+from snake.board import Board
+from snake.exceptions import GameOver
+
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+def make_snake() -> snake.Snake:
+    return snake.Snake([snake.Tile(5,5,GREEN), snake.Tile(5,6,GREEN),
+                        snake.Tile(5,7,GREEN)], snake.Dir.UP)
+
+def test_board_collides() -> None:
+    board = Board(nb_lines = 12, nb_cols = 24)
+    snk = make_snake()
+    board.add_object(snk)
+    assert list(board.collides(snake.Fruit(snake.Tile(5,6,RED)))) == [snk]
+    assert list(board.collides(snake.Fruit(snake.Tile(6,6,RED)))) == []
+    board.remove_object(snk)
+    assert list(board.collides(snake.Fruit(snake.Tile(5,6,RED)))) == []
+
+def test_board_tracks_moves() -> None:
+    board = Board(nb_lines = 12, nb_cols = 24)
+    snk = make_snake()
+    board.add_object(snk)
+    snk.move()
+    assert list(board.collides(snake.Fruit(snake.Tile(5,4,RED)))) == [snk]
+    assert list(board.collides(snake.Fruit(snake.Tile(5,7,RED)))) == []
+
+def test_board_fruit_eaten() -> None:
+    board = Board(nb_lines = 12, nb_cols = 24)
+    snk = make_snake()
+    fruit = snake.Fruit(snake.Tile(5,3,RED))
+    board.add_object(snk)
+    board.add_object(fruit)
+    snk.move()
+    assert snk.length == 3
+    snk.move()
+    assert snk.length == 4
+    objects = list(board.objects)
+    assert fruit not in objects
+    assert len(objects) == 2
+    new_fruit = objects[1]
+    assert list(board.collides(new_fruit)) == []
+
+def test_board_fruit_on_last_free_cell() -> None:
+    board = Board(nb_lines = 2, nb_cols = 3)
+    tiles = [snake.Tile(0,0,GREEN), snake.Tile(1,0,GREEN),
+             snake.Tile(2,0,GREEN), snake.Tile(2,1,GREEN),
+             snake.Tile(1,1,GREEN)]
+    board.add_object(snake.Snake(tiles, snake.Dir.LEFT))
+    for _ in range(10):
+        board.create_fruit()
+        fruit = list(board.objects)[-1]
+        assert list(fruit.tiles) == [snake.Tile(0,1,RED)]
+        board.remove_object(fruit)
+
+def test_board_full() -> None:
+    board = Board(nb_lines = 1, nb_cols = 2)
+    board.add_object(snake.Snake([snake.Tile(0,0,GREEN),
+                                  snake.Tile(1,0,GREEN)], snake.Dir.LEFT))
+    with pytest.raises(GameOver):
+        board.create_fruit()
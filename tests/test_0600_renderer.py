@@ -0,0 +1,76 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004,SLF001
+import pygame
+
+import snake
+from snake.board import Board
+from snake.renderer import Renderer
+
+def test_renderer_draw() -> None:
+    screen = pygame.Surface((24 * 10, 12 * 10))
+    board = Board(nb_lines = 12, nb_cols = 24)
+    board.add_object(snake.Fruit(snake.Tile(3, 1, (255, 0, 0))))
+    renderer = Renderer(screen, tile_size = 10)
+    renderer.draw(board)
+    assert screen.get_at((5, 5)) == pygame.Color(255, 255, 255)
+    assert screen.get_at((15, 5)) == pygame.Color(0, 0, 0)
+    assert screen.get_at((35, 15)) == pygame.Color(255, 0, 0)
+
+def test_renderer_background_cache() -> None:
+    screen = pygame.Surface((24 * 20, 12 * 20))
+    board = Board(nb_lines = 12, nb_cols = 24)
+    renderer = Renderer(screen, tile_size = 10)
+    renderer.draw(board)
+    background = renderer._background
+    renderer.draw(board)
+    assert renderer._background is background
+    renderer.tile_size = 20
+    renderer.draw(board)
+    assert renderer._background is not None
+    assert renderer._background is not background
+    assert renderer._background.get_size() == (24 * 20, 12 * 20)
+    background = renderer._background
+    renderer.bg_colors = ((0, 0, 255), (0, 0, 0))
+    renderer.draw(board)
+    assert renderer._background is not background
+    assert screen.get_at((5, 5)) == pygame.Color(0, 0, 255)
+
+def test_renderer_draw_dirty() -> None:
+    screen = pygame.Surface((24 * 10, 12 * 10))
+    full = pygame.Surface((24 * 10, 12 * 10))
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, track_dirty = True)
+    renderer = Renderer(screen, tile_size = 10)
+    renderer.draw(sim.board)
+    for _ in range(50):
+        if sim.step():
+            break
+        rects = renderer.draw_dirty(sim.board)
+        assert 2 <= len(rects) <= 5
+        Renderer(full, tile_size = 10).draw(sim.board)
+        assert (pygame.image.tobytes(screen, "RGB") ==
+                pygame.image.tobytes(full, "RGB"))
+
+def test_renderer_draw_snapshot() -> None:
+    colors = ("#00ff00", "#008800", "#ff0000")
+    screen = pygame.Surface((24 * 10, 12 * 10))
+    full = pygame.Surface((24 * 10, 12 * 10))
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 3,
+                           snake_head_color = colors[0],
+                           snake_body_color = colors[1],
+                           fruit_color = colors[2])
+    renderer = Renderer(screen, tile_size = 10)
+    assert len(renderer.draw_snapshot(sim.snapshot(), colors)) == 1
+    for i in range(50):
+        if sim.step():
+            break
+        snapshot = sim.snapshot()
+        rects = renderer.draw_snapshot(snapshot, colors)
+        assert 2 <= len(rects) <= 5
+        assert renderer.draw_snapshot(snapshot, colors) == []
+
+        # Same as drawing the board itself, skipping snapshots sometimes
+        if i % 3 == 0:
+            Renderer(full, tile_size = 10).draw(sim.board)
+            assert (pygame.image.tobytes(screen, "RGB") ==
+                    pygame.image.tobytes(full, "RGB"))
+        else:
+            sim.step()
@@ -0,0 +1,48 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004,SLF001
+import pygame
+import pytest
+
+import snake
+from snake.renderer import Renderer
+
+numpy_renderer = pytest.importorskip("snake.numpy_renderer")
+
+def test_numpy_renderer_matches_tiles() -> None:
+    screen = pygame.Surface((24 * 10, 12 * 10))
+    expected = pygame.Surface((24 * 10, 12 * 10))
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, track_dirty = True,
+                           fruit_color = "#cd0000")
+    renderer = numpy_renderer.NumpyRenderer(screen, tile_size = 10)
+    renderer.draw(sim.board)
+    for _ in range(50):
+        Renderer(expected, tile_size = 10).draw(sim.board)
+        assert (pygame.image.tobytes(screen, "RGB") ==
+                pygame.image.tobytes(expected, "RGB"))
+        if sim.step():
+            break
+        renderer.draw_dirty(sim.board)
+
+def test_numpy_renderer_draw_snapshot() -> None:
+    colors = ("#00ff00", "#008800", "#cd0000")
+    screen = pygame.Surface((24 * 10, 12 * 10))
+    expected = pygame.Surface((24 * 10, 12 * 10))
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 3,
+                           snake_head_color = colors[0],
+                           snake_body_color = colors[1],
+                           fruit_color = colors[2])
+    renderer = numpy_renderer.NumpyRenderer(screen, tile_size = 10)
+    tiles = Renderer(expected, tile_size = 10)
+    assert renderer.draw_snapshot(sim.snapshot(), colors) == [
+            screen.get_rect()]
+    background = renderer._background_grid
+    for _ in range(50):
+        if sim.step():
+            break
+        rects = renderer.draw_snapshot(sim.snapshot(), colors)
+        assert 2 <= len(rects) <= 5
+        tiles.draw_snapshot(sim.snapshot(), colors)
+        assert (pygame.image.tobytes(screen, "RGB") ==
+                pygame.image.tobytes(expected, "RGB"))
+
+    # The background grid is built once
+    assert renderer._background_grid is background
@@ -0,0 +1,68 @@
+# ruff: noqa: D100,D103,I001,FBT001,S101,S311,PLR2004,SLF001
+import random
+import typing
+
+import pytest
+
+import snake
+
+np = pytest.importorskip("numpy")
+batch = pytest.importorskip("snake.batch")
+
+if typing.TYPE_CHECKING:
+    from snake.batch import BatchSimulation
+
+def load(env: "BatchSimulation", sim: snake.Simulation) -> None:
+    """Copy the state of a simulation into the first game of a batch."""
+    cells = [t.y * 24 + t.x for t in sim.snake.tiles]
+    env._occ[0] = False
+    env._occ[0, cells] = True
+    env._body[0, :len(cells)] = cells
+    env._head_pos[0] = 0
+    env._size[0] = len(cells)
+    env._length[0] = sim.snake.length
+    env._dir[0] = batch.ACTIONS.index(sim.snake.dir)
+    fruit = next(o for o in sim.board.objects if isinstance(o, snake.Fruit))
+    env._fruit[0] = next(fruit.tiles).y * 24 + next(fruit.tiles).x
+
+@pytest.mark.parametrize("gameover_on_exit", [False, True])
+def test_batch_same_rules_as_simulation(gameover_on_exit: bool) -> None:
+    rnd = random.Random(0)
+    for _ in range(20):
+        sim = snake.Simulation(nb_lines = 12, nb_cols = 24,
+                               gameover_on_exit = gameover_on_exit)
+        env = batch.BatchSimulation(1, nb_lines = 12, nb_cols = 24,
+                                    gameover_on_exit = gameover_on_exit)
+        load(env, sim)
+        for _ in range(200):
+            action = rnd.choice([batch.NO_ACTION] * 6 + [0, 1, 2, 3])
+            done = sim.step(None if action == batch.NO_ACTION
+                            else batch.ACTIONS[action])
+            assert env.step(np.array([action]))[0] == done
+            if done:
+                break
+            assert env.lengths[0] == sim.snake.length
+            assert list(env.body(0)) == [t.y * 24 + t.x
+                                         for t in sim.snake.tiles]
+            # Fruits are drawn from different random streams
+            load(env, sim)
+
+def test_batch_step_and_reset() -> None:
+    env = batch.BatchSimulation(64, nb_lines = 12, nb_cols = 24, seed = 1)
+    assert (env.lengths == 3).all()
+    for _ in range(500):
+        done = env.step(np.random.default_rng(2).integers(-1, 4, 64))
+        for i in range(0, 64, 7):
+            body = env.body(i)
+            assert len(body) == env.lengths[i] or done[i]
+            assert env.fruits[i] not in body or done[i]
+        env.reset(done)
+    assert not env.done.any()
+
+def test_batch_full_board() -> None:
+    env = batch.BatchSimulation(1, nb_lines = 1, nb_cols = 4,
+                                snake_length = 1, seed = 3)
+    right = np.array([batch.ACTIONS.index(snake.Dir.RIGHT)])
+    while not env.step(right)[0]:
+        pass
+    assert env.lengths[0] == 4
@@ -0,0 +1,37 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+from snake.tournament import Aggregator, GameResult, play, run_tournament
+
+GREEDY = "snake.tournament:greedy"
+
+def test_play_is_reproducible() -> None:
+    results = [play("greedy", GREEDY, seed = 7, nb_lines = 12, nb_cols = 24,
+                    gameover_on_exit = False, max_ticks = 2000)
+               for _ in range(2)]
+    assert results[0] == results[1]
+    assert results[0].length > 3
+
+def test_play_timeout() -> None:
+    result = play("greedy", GREEDY, seed = 7, nb_lines = 12, nb_cols = 24,
+                  gameover_on_exit = False, max_ticks = 5)
+    assert result.ticks == 5
+    assert result.cause == "timeout"
+
+def test_run_tournament() -> None:
+    results = list(run_tournament({"a": GREEDY, "b": GREEDY}, [1, 2, 3],
+                                  nb_lines = 12, nb_cols = 24,
+                                  gameover_on_exit = True, max_ticks = 500,
+                                  workers = 2))
+    assert len(results) == 6
+    assert {(r.agent, r.seed) for r in results} == {
+            (a, s) for a in "ab" for s in [1, 2, 3]}
+
+def test_aggregator() -> None:
+    aggregator = Aggregator()
+    for agent, length in [("a", 4), ("b", 10), ("a", 6), ("b", 20)]:
+        aggregator.add(GameResult(agent = agent, seed = 0, length = length,
+                                  ticks = 10, cause = "self"))
+    board = aggregator.leaderboard()
+    assert [e[0] for e in board] == ["b", "a"]
+    assert board[0][1:4] == (15, 20, 10)
+    assert [(s.name, s.score) for s in aggregator.scores()] == [("b", 15),
+                                                               ("a", 5)]
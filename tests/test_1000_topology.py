@@ -0,0 +1,39 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pytest
+
+import snake
+from snake.exceptions import GameOver
+from snake.topology import WALL, Topology
+
+GREEN = (0, 255, 0)
+
+def test_topology_torus() -> None:
+    topo = Topology(nb_lines = 3, nb_cols = 4, wrap = True)
+    assert topo.next_cell(topo.cell(1, 1), snake.Dir.UP) == topo.cell(1, 0)
+    assert topo.next_cell(topo.cell(1, 0), snake.Dir.UP) == topo.cell(1, 2)
+    assert topo.next_cell(topo.cell(3, 2), snake.Dir.RIGHT) == topo.cell(0, 2)
+    assert topo.next_cell(topo.cell(0, 2), snake.Dir.LEFT) == topo.cell(3, 2)
+    assert topo.coords(topo.cell(3, 2)) == (3, 2)
+
+def test_topology_walls() -> None:
+    topo = Topology(nb_lines = 3, nb_cols = 4, wrap = False)
+    assert topo.next_cell(topo.cell(1, 0), snake.Dir.UP) == WALL
+    assert topo.next_cell(topo.cell(3, 2), snake.Dir.DOWN) == WALL
+    assert topo.next_cell(topo.cell(1, 1), snake.Dir.DOWN) == topo.cell(1, 2)
+
+def test_topology_shared() -> None:
+    assert (Topology.get(12, 24, wrap = True) is
+            Topology.get(12, 24, wrap = True))
+    assert (Topology.get(12, 24, wrap = True) is not
+            Topology.get(12, 24, wrap = False))
+
+def test_snake_with_topology() -> None:
+    tiles = [snake.Tile(0, 1, GREEN), snake.Tile(1, 1, GREEN)]
+    topo = Topology.get(3, 4, wrap = True)
+    snk = snake.Snake(tiles, snake.Dir.LEFT, topology = topo)
+    snk.move()
+    assert list(snk.tiles) == [snake.Tile(3, 1, GREEN), snake.Tile(0, 1, GREEN)]
+    snk = snake.Snake(tiles, snake.Dir.LEFT,
+                      topology = Topology.get(3, 4, wrap = False))
+    with pytest.raises(GameOver):
+        snk.move()
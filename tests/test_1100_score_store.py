@@ -0,0 +1,65 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import datetime
+from pathlib import Path
+
+from snake.score import Score
+from snake.score_store import (GameRecord, SqliteScoreStore, YamlScoreStore,
+                               open_score_store)
+
+def game(name: str, score: int, day: int = 1) -> GameRecord:
+    return GameRecord(name = name, score = score, width = 32, height = 24,
+                      fps = 10,
+                      timestamp = datetime.datetime(2024, 1, day,
+                                                    tzinfo = datetime.UTC))
+
+def test_open_score_store(tmp_path: Path) -> None:
+    assert isinstance(open_score_store(tmp_path / "s.yml"), YamlScoreStore)
+    assert isinstance(open_score_store(tmp_path / "s.db"), SqliteScoreStore)
+    assert isinstance(open_score_store(tmp_path / "s", "sqlite"),
+                      SqliteScoreStore)
+
+def test_yaml_store(tmp_path: Path) -> None:
+    store = YamlScoreStore(tmp_path / "s.yml", max_scores = 3)
+    assert [s.score for s in store.load()] == [100, 80, 60]
+    store.record(game("Moi", 90))
+    store.record(game("Toi", 10))
+    assert [(s.name, s.score) for s in store.load()] == [
+            ("Joe", 100), ("Moi", 90), ("Jack", 80)]
+
+def test_sqlite_store(tmp_path: Path) -> None:
+    store = SqliteScoreStore(tmp_path / "s.db", max_scores = 3)
+    assert [s.score for s in store.load()] == [100, 80, 60]
+    for i, (name, score) in enumerate([("a", 5), ("b", 12), ("a", 9),
+                                       ("c", 1), ("b", 3)]):
+        store.record(game(name, score, day = i + 1))
+    store.close()
+
+    store = SqliteScoreStore(tmp_path / "s.db", max_scores = 3)
+    assert store.count() == 5
+    assert [(s.name, s.score) for s in store.load()] == [("b", 12), ("a", 9),
+                                                        ("a", 5)]
+    assert [g.score for g in store.top(2)] == [12, 9]
+    assert store.best_per_player() == [("b", 12), ("a", 9), ("c", 1)]
+    assert store.best_per_player(1) == [("b", 12)]
+    games = store.between(game("", 0, day = 2).timestamp,
+                          game("", 0, day = 4).timestamp)
+    assert games == [game("b", 12, day = 2), game("a", 9, day = 3)]
+
+def test_sqlite_store_rank(tmp_path: Path) -> None:
+    store = SqliteScoreStore(tmp_path / "s.db", max_scores = 2)
+    store.record_many([game(str(i), i % 10) for i in range(100)])
+    scores = store.load()
+    assert [s.score for s in scores] == [9, 9]
+    assert len(scores) == 100
+    assert scores.rank(8) == 11
+    assert scores.rank(20) == 1
+
+    # A new score is ranked after the equal ones, and counted once when
+    # stored
+    assert scores.add_score(Score(name = "new", score = 8)) == 21
+    store.record(game("new", 8))
+    assert len(scores) == 101
+    assert scores.rank(8) == 11
+    assert scores.add_score(Score(name = "best", score = 10)) == 1
+    assert [s.name for s in scores] == ["best", "9"]
+    assert len(scores) == 102
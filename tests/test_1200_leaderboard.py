@@ -0,0 +1,58 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import random
+
+from snake.leaderboard import Leaderboard, ScoreCounts
+from snake.score import Score
+from snake.scores import Scores
+
+def test_leaderboard_matches_sorted_list() -> None:
+    rnd = random.Random(0)
+    board = Leaderboard([Score(name = "x", score = rnd.randint(0, 50))
+                         for _ in range(300)])
+    board.LOAD = 8
+    expected = sorted((s.score for s in board), reverse = True)
+    for i in range(2000):
+        score = Score(name = str(i), score = rnd.randint(0, 1000))
+        assert board.rank(score.score) == 1 + sum(1 for s in expected
+                                                  if s > score.score)
+        rank = board.add(score)
+        expected.insert(rank - 1, score.score)
+        assert expected == sorted(expected, reverse = True)
+    assert len(board) == 2300
+    assert [s.score for s in board] == expected
+    assert [s.score for s in board.top(10)] == expected[:10]
+
+def test_leaderboard_ties() -> None:
+    board = Leaderboard()
+    assert board.rank(10) == 1
+    assert board.add(Score(name = "a", score = 10)) == 1
+    assert board.add(Score(name = "b", score = 10)) == 2
+    assert board.add(Score(name = "c", score = 20)) == 1
+    assert board.rank(10) == 2
+    assert board.rank(5) == 4
+    assert [s.name for s in board] == ["c", "a", "b"]
+
+def test_score_counts_matches_sorted_list() -> None:
+    rnd = random.Random(0)
+    scores = [rnd.randint(0, 50) for _ in range(300)]
+    counts = ScoreCounts((s, 1) for s in scores)
+    expected = sorted(scores, reverse = True)
+    for _ in range(2000):
+        score = rnd.randint(-10, 100)
+        assert counts.rank(score) == 1 + sum(1 for s in expected if s > score)
+        rank = counts.add(score)
+        assert rank == sum(1 for s in expected if s >= score) + 1
+        expected.insert(rank - 1, score)
+    assert len(counts) == 2300
+    assert ScoreCounts([(5, 2), (7, 1), (5, 3)]).rank(5) == 2
+
+def test_scores_rank() -> None:
+    scores = Scores.default(3)
+    assert [s.score for s in scores] == [100, 80, 60]
+    assert len(scores) == 4
+    assert scores.add_score(Score(name = "low", score = 10)) == 5
+    assert [s.score for s in scores] == [100, 80, 60]
+    assert scores.add_score(Score(name = "high", score = 90)) == 2
+    assert [s.name for s in scores] == ["Joe", "high", "Jack"]
+    assert scores.rank(70) == 4
+    assert len(scores) == 6
@@ -0,0 +1,38 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import concurrent.futures
+from pathlib import Path
+
+from snake.score_store import GameRecord, SqliteScoreStore, YamlScoreStore
+from snake.score_writer import ScoreWriter
+
+def game(name: str, score: int) -> GameRecord:
+    return GameRecord(name = name, score = score, width = 32, height = 24,
+                      fps = 10)
+
+def test_score_writer_yaml(tmp_path: Path) -> None:
+    store = YamlScoreStore(tmp_path / "s.yml", max_scores = 5)
+    writer = ScoreWriter(store)
+    for i in range(10):
+        writer.submit(game(f"p{i}", 100 + i))
+    writer.close()
+    assert [s.score for s in store.load()] == [109, 108, 107, 106, 105]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+def test_score_writer_sqlite(tmp_path: Path) -> None:
+    store = SqliteScoreStore(tmp_path / "s.db")
+    writer = ScoreWriter(store, max_pending = 2)
+    for i in range(20):
+        writer.submit(game(f"p{i}", i))
+    writer.close()
+    assert store.count() == 20
+
+def record(path: Path, name: str) -> None:
+    YamlScoreStore(path, max_scores = 20).record_many(
+            [game(name + str(i), 200 + i) for i in range(3)])
+
+def test_shared_yaml_file(tmp_path: Path) -> None:
+    path = tmp_path / "s.yml"
+    with concurrent.futures.ProcessPoolExecutor(4) as pool:
+        list(pool.map(record, [path] * 4, "abcd"))
+    names = {s.name for s in YamlScoreStore(path, max_scores = 20).load()}
+    assert {n + str(i) for n in "abcd" for i in range(3)} <= names
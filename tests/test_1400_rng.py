@@ -0,0 +1,47 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pickle
+
+import snake
+from snake.rng import Rng
+
+def play(seed: int) -> list[tuple[int, int]]:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = seed)
+    actions = [snake.Dir.UP, None, snake.Dir.LEFT, None, snake.Dir.DOWN,
+               None, snake.Dir.RIGHT, None]
+    heads = []
+    for i in range(300):
+        if sim.step(actions[i % len(actions)]):
+            sim.reset()
+        head = next(sim.snake.tiles)
+        heads.append((head.x, head.y))
+    return heads
+
+def test_simulation_reproducible() -> None:
+    assert play(42) == play(42)
+    assert play(42) != play(43)
+    assert snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 5).seed == 5
+
+def test_rng_index() -> None:
+    rng = Rng(1)
+    values = [rng.index(7) for _ in range(1000)]
+    assert set(values) == set(range(7))
+    other = Rng(1)
+    assert [other.index(7) for _ in range(1000)] == values
+
+def test_rng_state() -> None:
+    rng = Rng(1)
+    for _ in range(10):
+        rng.index(10)
+    state = rng.getstate()
+    copy = pickle.loads(pickle.dumps(rng))
+    expected = [rng.index(100) for _ in range(500)]
+    assert [copy.index(100) for _ in range(500)] == expected
+    rng.setstate(state)
+    assert [rng.index(100) for _ in range(500)] == expected
+
+def test_rng_split() -> None:
+    streams = Rng(3).split(4)
+    assert [s.initial_seed for s in streams] == [
+            s.initial_seed for s in Rng(3).split(4)]
+    assert len({s.initial_seed for s in streams}) == 4
+    assert len({s.random() for s in streams}) == 4
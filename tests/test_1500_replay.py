@@ -0,0 +1,113 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import dataclasses
+import io
+from pathlib import Path
+
+import pytest
+
+import snake
+from snake.exceptions import ReplayError
+from snake.replay import (Recorder, Replay, read_varint, unzigzag,
+                          write_varint, zigzag)
+
+ACTIONS = [snake.Dir.UP, None, None, snake.Dir.LEFT, snake.Dir.LEFT, None,
+           snake.Dir.DOWN, None, None, None, snake.Dir.RIGHT, None]
+
+def record(seed: int, ticks: int = 200) -> tuple[Replay, list[tuple[int, int]]]:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = seed)
+    recorder = Recorder(sim)
+    heads = []
+    for i in range(ticks):
+        action = ACTIONS[i % len(ACTIONS)]
+        recorder.turn(action)
+        over = sim.step(action)
+        head = next(sim.snake.tiles)
+        heads.append((head.x, head.y))
+        if over:
+            break
+    return recorder.replay(), heads
+
+def test_varint() -> None:
+    for value in (0, 1, 127, 128, 300, 2 ** 40):
+        out = io.BytesIO()
+        write_varint(out, value)
+        assert len(out.getvalue()) == max(1, (value.bit_length() + 6) // 7)
+        assert read_varint(io.BytesIO(out.getvalue())) == value
+    for value in (0, -1, 1, -2, 2, -(2 ** 62), 2 ** 62):
+        assert unzigzag(zigzag(value)) == value
+    assert [zigzag(v) for v in (0, -1, 1, -2)] == [0, 1, 2, 3]
+
+def test_replay_round_trip(tmp_path: Path) -> None:
+    replay, _ = record(seed = 42)
+    assert Replay.from_bytes(replay.to_bytes()) == replay
+    path = tmp_path / "game.snkr"
+    replay.save(path)
+    assert Replay.load(path) == replay
+    # A few bytes per turn only
+    assert len(replay.to_bytes()) < 20 + 3 * len(replay.turns)
+
+def test_replay_play() -> None:
+    replay, heads = record(seed = 7)
+    assert replay.turns
+    played = []
+    for sim in replay.play():
+        head = next(sim.snake.tiles)
+        played.append((head.x, head.y))
+    assert played == heads
+    assert replay.verify()
+
+def test_replay_second_game() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 3)
+    for _ in range(10):
+        sim.step()
+    sim.reset()
+    assert sim.game_seed != sim.seed
+    recorder = Recorder(sim)
+    for _ in range(50):
+        recorder.turn(snake.Dir.UP)
+        if sim.step(snake.Dir.UP):
+            break
+    assert recorder.replay().verify()
+
+def test_replay_errors() -> None:
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(b"NOPE")
+    data = record(seed = 1, ticks = 20)[0].to_bytes()
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data[:-2])
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(data[:4] + b"\x09" + data[5:])
+
+def test_replay_seek() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 0)
+    actions = [snake.Dir.UP, *[None] * 12, snake.Dir.RIGHT, *[None] * 30]
+    recorder = Recorder(sim, keyframe_interval = 16)
+    states = [sim.snapshot()]
+    for i in range(600):
+        action = actions[i % len(actions)]
+        recorder.turn(action)
+        if sim.step(action):
+            break
+        states.append(sim.snapshot())
+    replay = Replay.from_bytes(recorder.replay().to_bytes())
+    assert len(replay.keyframes) == (len(states) - 1) // 16
+    assert replay.verify()
+    assert len(states) == 601
+    for tick in (0, 1, 15, 16, 17, 300, 37, 599, 600):
+        assert replay.seek(tick).snapshot() == states[tick]
+
+    # Seeking forward from a given simulation
+    sim = replay.seek(20)
+    assert replay.seek(40, sim).snapshot() == states[40]
+
+def test_replay_corrupted_keyframe() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 11)
+    recorder = Recorder(sim, keyframe_interval = 4)
+    for _ in range(10):
+        recorder.turn(None)
+        sim.step()
+    replay = recorder.replay()
+    bad = dataclasses.replace(replay.keyframes[0], data = b"garbage")
+    replay = dataclasses.replace(replay, keyframes = (bad,))
+    with pytest.raises(ReplayError):
+        replay.seek(5)
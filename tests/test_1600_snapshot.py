@@ -0,0 +1,63 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pickle
+
+import pytest
+
+import snake
+
+ACTIONS = [snake.Dir.UP, None, snake.Dir.LEFT, None, snake.Dir.DOWN, None,
+           None, snake.Dir.RIGHT, None, None]
+
+def play(sim: snake.Simulation, ticks: int) -> list[snake.Tile]:
+    heads = []
+    for i in range(ticks):
+        sim.step(ACTIONS[i % len(ACTIONS)])
+        heads.append(next(sim.snake.tiles))
+    return heads
+
+def test_snapshot_restore() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 4)
+    play(sim, 30)
+    snapshot = sim.snapshot()
+    assert snapshot.length == sim.snake.length
+    assert snapshot.ticks == 30
+    expected = play(sim, 200)
+    sim.restore(snapshot)
+    assert sim.snapshot() == snapshot
+    assert play(sim, 200) == expected
+
+def test_snapshot_pickle() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 4)
+    play(sim, 10)
+    snapshot = sim.snapshot()
+    with pytest.raises(AttributeError):
+        snapshot.ticks = 0 # type: ignore[misc]
+    other = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 8)
+    other.restore(pickle.loads(pickle.dumps(snapshot)))
+    assert play(other, 100) == play(sim, 100)
+
+def test_snapshot_wrong_size() -> None:
+    snapshot = snake.Simulation(nb_lines = 12, nb_cols = 24).snapshot()
+    with pytest.raises(ValueError, match = "Cannot restore"):
+        snake.Simulation(nb_lines = 10, nb_cols = 24).restore(snapshot)
+
+def test_fork() -> None:
+    sim = snake.Simulation(nb_lines = 12, nb_cols = 24, seed = 4,
+                           track_dirty = True)
+    play(sim, 20)
+    fork = sim.fork()
+    assert fork.snapshot() == sim.snapshot()
+    assert fork.board.pop_dirty() == {}
+
+    # The fork goes its own way, without changing the simulation
+    snapshot = sim.snapshot()
+    for _ in range(50):
+        fork.step(snake.Dir.DOWN)
+    assert sim.snapshot() == snapshot
+    assert play(fork.fork(), 10) == play(fork, 10)
+
+    # Following games are the same too
+    fork = sim.fork()
+    sim.reset()
+    fork.reset()
+    assert fork.snapshot() == sim.snapshot()
@@ -0,0 +1,48 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pstats
+import time
+from pathlib import Path
+
+from snake.profiler import FRAME, PHASES, FrameProfiler, PhaseTimes
+
+def test_phase_times() -> None:
+    times = PhaseTimes(window = 100)
+    for i in range(1, 201):
+        times.add(i / 1000)
+    assert times.count == 200
+    assert times.max == 0.2
+    assert abs(times.mean - 0.1005) < 1e-9
+    # Only the last 100 durations count for percentiles
+    assert times.percentiles() == (0.151, 0.196, 0.2)
+    assert times.window_max() == 0.2
+    assert PhaseTimes().percentiles() == (0.0, 0.0, 0.0)
+
+def test_frame_profiler(tmp_path: Path) -> None:
+    stats = tmp_path / "stats.prof"
+    profiler = FrameProfiler(budget = 0.005, stats_file = stats)
+    profiler.start()
+    for i in range(4):
+        profiler.start_frame()
+        for phase in PHASES:
+            if phase == "draw" and i == 0:
+                time.sleep(0.01)
+            profiler.lap(phase)
+        profiler.end_frame()
+    profiler.stop()
+    assert profiler[FRAME].count == 4
+    assert profiler["draw"].max >= 0.01
+    assert profiler[FRAME].max >= profiler["draw"].max
+    assert profiler.over_budget == 1
+    assert len(profiler.lines()) == len(PHASES) + 2
+    assert "4 frames profiled, 1 over" in profiler.summary()
+    # The laps have been profiled
+    functions = pstats.Stats(str(stats)).get_stats_profile().func_profiles
+    assert "lap" in functions
+
+def test_frame_profiler_disabled() -> None:
+    profiler = FrameProfiler(budget = 0.1, enabled = False)
+    profiler.start_frame()
+    profiler.lap("events")
+    profiler.end_frame()
+    assert profiler[FRAME].count == 0
+    assert profiler["events"].count == 0
@@ -0,0 +1,55 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import json
+from pathlib import Path
+
+import pytest
+
+from snake.benchmark import (cases, compare, hamiltonian_cycle, main, run,
+                             snake_length)
+from snake.exceptions import RegressionError
+
+def test_hamiltonian_cycle() -> None:
+    cycle = hamiltonian_cycle(12, 25)
+    assert len(set(cycle)) == len(cycle) == 12 * 25
+    for (x, y), (nx, ny) in zip(cycle, cycle[1:] + cycle[:1], strict = True):
+        assert abs(nx - x) + abs(ny - y) == 1
+    with pytest.raises(ValueError, match = "odd"):
+        hamiltonian_cycle(13, 24)
+
+def test_snake_length() -> None:
+    assert snake_length(12, 24, 0) == 3
+    assert snake_length(12, 24, 50) == 144
+    assert snake_length(12, 24, 100) == 12 * 24 - 1
+
+def test_run() -> None:
+    selected = [c for c in cases()
+                if "lines=12" in c.key or "scores=5]" in c.key]
+    assert {c.name for c in selected} == {
+            "snake.move", "board.collides", "board.create_fruit",
+            "board.draw", "checkerboard.draw", "scores.save", "scores.load"}
+    results = run(selected, repeat = 1, min_time = 0.001)
+    assert set(results) == {c.key for c in selected}
+    for result in results.values():
+        assert result["seconds"] > 0
+        assert result["number"] >= 1
+
+def test_compare() -> None:
+    baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}}
+    results = {"a": {"seconds": 1.2}, "b": {"seconds": 2.0},
+               "c": {"seconds": 9.0}}
+    assert compare(results, baseline, tolerance = 0.25) == [("b", 2.0)]
+
+def test_main(tmp_path: Path) -> None:
+    output = tmp_path / "results.json"
+    args = ["-k", "snake.move[cols=24,lines=12,length=3]", "-r", "1",
+            "--min-time", "0.001"]
+    main([*args, "-o", str(output)])
+    data = json.loads(output.read_text())
+    (result,) = data["results"].values()
+    main([*args, "-b", str(output), "--tolerance", "100"])
+
+    # A much faster baseline
+    result["seconds"] /= 1000
+    output.write_text(json.dumps(data))
+    with pytest.raises(RegressionError):
+        main([*args, "-b", str(output)])
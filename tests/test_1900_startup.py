@@ -0,0 +1,37 @@
+# ruff: noqa: D100,D103,I001,S101,S603,PLR2004
+import subprocess
+import sys
+from pathlib import Path
+
+from snake.score_store import YamlScoreStore
+
+# Modules that the command line must not load
+MODULES = ("pygame", "yaml", "sqlite3")
+
+def run(*args: str) -> subprocess.CompletedProcess[str]:
+    code = "\n".join(["import sys", "from snake.main import main",
+                      f"MODULES = {MODULES!r}",
+                      "sys.argv = sys.argv[1:]", "try:", "    main()",
+                      "finally:",
+                      "    print(*(m in sys.modules for m in MODULES),",
+                      "          file = sys.stderr)"])
+    return subprocess.run([sys.executable, "-c", code, "snake", *args],
+                          capture_output = True, text = True, check = False)
+
+def test_help_no_pygame() -> None:
+    result = run("--help")
+    assert result.returncode == 0
+    assert "--fruit-color" in result.stdout
+    assert result.stderr.strip().endswith("False False False")
+
+def test_bad_args_no_pygame() -> None:
+    result = run("--fruit-color", "red")
+    assert result.returncode == 1
+    assert 'Color "red"' in result.stdout
+    assert result.stderr.strip().split()[-3] == "False"
+
+def test_default_scores_not_written(tmp_path: Path) -> None:
+    path = tmp_path / "s.yml"
+    store = YamlScoreStore(path)
+    assert [s.score for s in store.load()] == [100, 80, 60, 40]
+    assert not path.exists()
@@ -0,0 +1,28 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import pygame
+
+from snake.text_cache import TextCache
+
+def test_text_cache() -> None:
+    pygame.font.init()
+    font = pygame.font.Font(None, 20)
+    cache = TextCache(max_size = 2)
+    a = cache.render(font, "a", "red")
+    assert cache.render(font, "a", "red") is a
+    assert cache.render(font, "a", (0, 0, 255)) is not a
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # The least recently used text is dropped
+    cache.render(font, "a", "red")
+    cache.render(font, "b", "red")
+    assert len(cache) == 2
+    assert cache.render(font, "a", "red") is a
+    assert cache.misses == 3
+    cache.render(font, "a", (0, 0, 255))
+    assert cache.misses == 4
+
+    # Different fonts give different surfaces
+    big = pygame.font.Font(None, 40)
+    assert cache.render(big, "a", "red").get_height() > a.get_height()
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,186 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004,SLF001
+import os
+import threading
+import time
+from pathlib import Path
+
+import pygame
+import pytest
+
+import snake
+from snake.game import Game
+from snake.replay import SUFFIX, Replay
+from snake.score_store import SqliteScoreStore
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+def event(type_: int, **kwargs: int | str) -> pygame.event.Event:
+    return pygame.event.Event(type_, **kwargs)
+
+def make_game(tmp_path: Path) -> Game:
+    return Game(width = 24, height = 12, tile_size = 10, fps = 10,
+                fruit_color = "#ff0000", snake_head_color = "#00ff00",
+                snake_body_color = "#008800", gameover_on_exit = False,
+                score_file = tmp_path / "s.yml", seed = 1)
+
+def test_game_idle(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Nothing happens for a while, then the mouse moves, a key is pressed
+    # and the window is closed
+    waits = iter([*[event(pygame.NOEVENT)] * 5, event(pygame.MOUSEMOTION),
+                  event(pygame.KEYDOWN, key = pygame.K_a, unicode = "a"),
+                  event(pygame.QUIT)])
+    timeouts = []
+
+    def wait(timeout: int) -> pygame.event.Event:
+        timeouts.append(timeout)
+        return next(waits)
+
+    updates = []
+    monkeypatch.setattr(pygame.event, "wait", wait)
+    monkeypatch.setattr(pygame.event, "get", list)
+    monkeypatch.setattr(pygame.display, "update",
+                        lambda *args: updates.append(args))
+    make_game(tmp_path).start()
+
+    # Drawn at start, on the key press and on quitting only
+    assert len(timeouts) == 8
+    assert all(t > 0 for t in timeouts)
+    assert len(updates) == 3
+
+class FakeClock:
+    """A clock where each frame lasts 50 ms."""
+
+    def tick(self, _fps: int = 0) -> int:
+        """Get the time since the last frame."""
+        return 50
+
+def test_game_fixed_timestep(tmp_path: Path,
+                             monkeypatch: pytest.MonkeyPatch) -> None:
+    # Two turns typed within the same frame, the second one twice
+    second = snake.Simulation(12, 24, seed = 1).snake.dir
+    first = (snake.Dir.LEFT if second in (snake.Dir.UP, snake.Dir.DOWN)
+             else snake.Dir.UP)
+    keys = {snake.Dir.UP: pygame.K_UP, snake.Dir.LEFT: pygame.K_LEFT,
+            snake.Dir.DOWN: pygame.K_DOWN, snake.Dir.RIGHT: pygame.K_RIGHT}
+    gets = iter([[], [event(pygame.KEYDOWN, key = keys[d], unicode = "")
+                      for d in (first, second, second)],
+                 [], [], [], [], [], [], [event(pygame.QUIT)]])
+    monkeypatch.setattr(pygame.event, "get", lambda: next(gets))
+    monkeypatch.setattr(pygame.event, "wait", lambda _timeout: event(
+            pygame.KEYDOWN, key = pygame.K_SPACE, unicode = " "))
+    monkeypatch.setattr(pygame.time, "Clock", FakeClock)
+
+    actions = []
+    step = snake.Simulation.step
+
+    def spy(sim: snake.Simulation, action: snake.Dir | None = None) -> bool:
+        actions.append(action)
+        return step(sim, action)
+
+    monkeypatch.setattr(snake.Simulation, "step", spy)
+    game = make_game(tmp_path)
+    game.start()
+
+    # 10 ticks per second, 20 frames per second: a tick every other frame,
+    # taking one queued turn each
+    assert actions == [first, second, None]
+
+def test_game_over_first_tick(tmp_path: Path,
+                              monkeypatch: pytest.MonkeyPatch) -> None:
+    # SPACE is pressed on the first frame, which plays a tick at once, where
+    # the snake dies, then the window is closed while typing a name
+    gets = iter([[event(pygame.KEYDOWN, key = pygame.K_SPACE, unicode = " ")]])
+    monkeypatch.setattr(pygame.event, "get", lambda: next(gets, []))
+    monkeypatch.setattr(pygame.event, "wait",
+                        lambda _timeout: event(pygame.QUIT))
+    monkeypatch.setattr(pygame.time, "Clock", FakeClock)
+    steps = []
+
+    def die(_sim: snake.Simulation, action: snake.Dir | None = None) -> bool:
+        steps.append(action)
+        return True
+
+    monkeypatch.setattr(snake.Simulation, "step", die)
+    game = Game(width = 24, height = 12, tile_size = 10, fps = 20,
+                fruit_color = "#ff0000", snake_head_color = "#00ff00",
+                snake_body_color = "#008800", gameover_on_exit = False,
+                score_file = tmp_path / "s.yml", seed = 1)
+    game.start()
+
+    # The game over screen was displayed, then the score placed
+    assert steps == [None]
+    assert game._placed is not None
+
+class SleepingClock:
+    """A clock where each frame lasts 2 ms, for real."""
+
+    def tick(self, _fps: int = 0) -> int:
+        """Wait for the end of the frame, and get its duration."""
+        time.sleep(0.002)
+        return 2
+
+def test_game_sim_thread(tmp_path: Path,
+                         monkeypatch: pytest.MonkeyPatch) -> None:
+    # Start a game, wait for it to end, then quit while typing a name
+    waits = iter([event(pygame.KEYDOWN, key = pygame.K_SPACE, unicode = " "),
+                  event(pygame.QUIT)])
+    monkeypatch.setattr(pygame.event, "wait", lambda _timeout: next(waits))
+    monkeypatch.setattr(pygame.event, "get", list)
+    monkeypatch.setattr(pygame.time, "Clock", SleepingClock)
+    game = Game(width = 24, height = 12, tile_size = 10, fps = 200,
+                render_fps = 50, fruit_color = "#ff0000",
+                snake_head_color = "#00ff00", snake_body_color = "#008800",
+                gameover_on_exit = True, score_file = tmp_path / "s.yml",
+                seed = 1, record_dir = tmp_path, sim_thread = True)
+    game.start()
+
+    # The game played by the worker is the one replayed
+    replays = list(tmp_path.glob(f"*{SUFFIX}"))
+    assert len(replays) == 1
+    replay = Replay.load(replays[0])
+    assert replay.ticks > 0
+    assert replay.verify()
+    assert not any(t.name == "simulation" for t in threading.enumerate())
+
+def test_game_start_after_idle(tmp_path: Path,
+                               monkeypatch: pytest.MonkeyPatch) -> None:
+    # SPACE is pressed after a while on the score screen, then three frames
+    # are drawn, with the real clock
+    def wait(_timeout: int) -> pygame.event.Event:
+        time.sleep(0.6)
+        return event(pygame.KEYDOWN, key = pygame.K_SPACE, unicode = " ")
+
+    # (the events coming with SPACE are got too)
+    gets = iter([[], [], [], [], [], [event(pygame.QUIT)]])
+    monkeypatch.setattr(pygame.event, "wait", wait)
+    monkeypatch.setattr(pygame.event, "get", lambda: next(gets))
+    steps = []
+    step = snake.Simulation.step
+
+    def spy(sim: snake.Simulation, action: snake.Dir | None = None) -> bool:
+        steps.append(action)
+        return step(sim, action)
+
+    monkeypatch.setattr(snake.Simulation, "step", spy)
+    game = Game(width = 24, height = 12, tile_size = 10, fps = 10,
+                render_fps = 20, fruit_color = "#ff0000",
+                snake_head_color = "#00ff00", snake_body_color = "#008800",
+                gameover_on_exit = False, score_file = tmp_path / "s.yml",
+                seed = 1)
+    game.start()
+
+    # The time spent waiting is not played: 150 ms at 10 ticks per second
+    assert 1 <= len(steps) <= 2
+
+def test_game_closes_scores(tmp_path: Path,
+                            monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pygame.event, "get", lambda: [event(pygame.QUIT)])
+    closed = []
+    monkeypatch.setattr(SqliteScoreStore, "close",
+                        lambda store: closed.append(store.path))
+    game = Game(width = 24, height = 12, tile_size = 10, fps = 10,
+                fruit_color = "#ff0000", snake_head_color = "#00ff00",
+                snake_body_color = "#008800", gameover_on_exit = False,
+                score_file = tmp_path / "s.db")
+    game.start()
+    assert closed == [tmp_path / "s.db"]
@@ -0,0 +1,95 @@
+# ruff: noqa: D100,D103,I001,S101,PLR2004
+import threading
+import time
+
+import pytest
+
+import snake
+from snake.sim_worker import FrameBuffer, SimulationWorker
+
+def wait_game_over(worker: SimulationWorker) -> snake.Snapshot:
+    deadline = time.monotonic() + 10
+    while worker.playing:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    return worker.latest()
+
+def test_frame_buffer() -> None:
+    sim = snake.Simulation(12, 24, seed = 1)
+    first = sim.snapshot()
+    buffer = FrameBuffer(first)
+    assert buffer.read() is first
+    sim.step()
+    second = sim.snapshot()
+    buffer.publish(second)
+    assert buffer.read() is second
+    buffer.publish(first)
+    assert buffer.read() is first
+
+def test_worker_game() -> None:
+    # The worker plays the same game as the simulation alone
+    sim = snake.Simulation(12, 24, seed = 1, gameover_on_exit = True)
+    expected = snake.Simulation(12, 24, seed = 1, gameover_on_exit = True)
+    worker = SimulationWorker(sim, fps = 1000)
+    assert worker.latest() == expected.snapshot()
+    assert not worker.playing
+    worker.play()
+    last = wait_game_over(worker)
+    while not expected.step():
+        pass
+    assert last == expected.snapshot()
+    assert last.game_over
+
+    # A new game, started while the worker does not play
+    with worker.locked() as locked:
+        assert locked is sim
+        sim.reset()
+    assert worker.latest().ticks == 0
+    assert not worker.latest().game_over
+    worker.close()
+
+def test_worker_turns() -> None:
+    sim = snake.Simulation(12, 24, seed = 1)
+    actions = []
+
+    def step(action: snake.Dir | None) -> bool:
+        actions.append(action)
+        sim.step(action)
+        return len(actions) == 3
+
+    # Turns typed before playing are dropped, a turn changing nothing is not
+    # queued, and only two turns are kept
+    worker = SimulationWorker(sim, fps = 10, step = step, queue_size = 2)
+    worker.turn(snake.Dir.UP)
+    direction = sim.snake.dir
+    worker.play()
+    worker.turn(direction)
+    turns = [d for d in snake.Dir if d.x != direction.x and d.y != direction.y]
+    for d in (*turns, direction):
+        worker.turn(d)
+    wait_game_over(worker)
+    worker.close()
+    assert actions == [turns[0], turns[1], None]
+
+def test_worker_pace() -> None:
+    sim = snake.Simulation(12, 24, seed = 1)
+    worker = SimulationWorker(sim, fps = 100)
+    start = time.perf_counter()
+    worker.play()
+    time.sleep(0.2)
+    ticks = worker.latest().ticks
+    worker.close()
+    assert 10 <= ticks <= 21 * (time.perf_counter() - start) / 0.2
+    assert not any(t.name == "simulation" for t in threading.enumerate())
+
+def test_worker_error() -> None:
+    def step(_action: snake.Dir | None) -> bool:
+        raise RuntimeError
+
+    worker = SimulationWorker(snake.Simulation(12, 24), fps = 1000,
+                              step = step)
+    worker.play()
+    with pytest.raises(RuntimeError):
+        wait_game_over(worker)
+    with pytest.raises(RuntimeError):
+        worker.close()